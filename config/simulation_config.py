@@ -74,6 +74,7 @@ DEFAULT_CONFIG = {
     'show_preview': False,            # Whether to show preview
     'save_animation': True,           # Whether to save animation
     'animation_format': 'html',       # Animation format ('html' or 'mp4')
+    'live_backend': 'mpl',            # Live view backend ('mpl' or 'pyqtgraph' for very large fleets)
     
     # Data management parameters
     'save_data': False,               # Whether to save simulation data
@@ -93,6 +94,10 @@ VEHICLE_STATUS = {
     'CHARGING': 'charging'                 # Charging
 }
 
+# Integer codes for vehicle statuses (used by array-based state views)
+VEHICLE_STATUS_CODES = {status: code for code, status in enumerate(VEHICLE_STATUS.values())}
+UNKNOWN_STATUS_CODE = len(VEHICLE_STATUS_CODES)
+
 # ============= Order Status Definitions =============
 ORDER_STATUS = {
     'PENDING': 'pending',              # Waiting for assignment
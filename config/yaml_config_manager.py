@@ -5,12 +5,19 @@ YAML Configuration Manager
 
 import yaml
 import json
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from pydantic import BaseModel, ValidationError, Field
 from datetime import datetime
 import os
 
+# 优先使用libyaml的C实现（快5-10倍），不可用时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 
 class SimulationConfigModel(BaseModel):
     """仿真配置的Pydantic模型，用于验证YAML配置"""
@@ -50,6 +57,7 @@ class SimulationConfigModel(BaseModel):
         animation_fps: int = Field(default=60, ge=1, le=120, description="动画帧率")
         save_animation: bool = Field(default=True, description="是否保存动画")
         animation_format: str = Field(default="html", description="动画格式")
+        live_backend: str = Field(default="mpl", description="实时可视化后端: mpl=matplotlib, pyqtgraph=大规模车队")
     
     class DataSection(BaseModel):
         save_data: bool = Field(default=False, description="是否保存数据")
@@ -69,6 +77,15 @@ class SimulationConfigModel(BaseModel):
     
     class Config:
         extra = "allow"  # 允许额外字段，便于扩展
+    
+    @cached_property
+    def dict_cached(self) -> Dict[str, Any]:
+        """序列化后的字典，首次访问时计算并缓存（用于只读的已加载配置，勿在修改模型后使用）"""
+        return self.model_dump()
+
+
+# 默认配置实例，用于摘要读取时补全缺省字段
+_DEFAULT_CONFIG = SimulationConfigModel()
 
 
 class YAMLConfigManager:
@@ -87,9 +104,15 @@ class YAMLConfigManager:
         self.templates_dir = self.config_dir / "templates"
         self.templates_dir.mkdir(exist_ok=True)
         
+        # 配置摘要的JSON索引目录（列表接口读取，避免解析YAML）
+        self.meta_dir = self.config_dir / ".meta"
+        
         # 默认配置文件路径
         self.default_config_path = self.config_dir / "default.yaml"
         
+        # 目录列表缓存: 目录路径 -> (目录mtime, 文件名列表)，目录内容变化时mtime随之改变
+        self._listing_cache: Dict[Path, Tuple[int, List[str]]] = {}
+        
         # 创建默认配置文件
         self._ensure_default_config()
         
@@ -123,7 +146,7 @@ class YAMLConfigManager:
         
         try:
             with open(config_path, 'r', encoding='utf-8') as file:
-                yaml_data = yaml.safe_load(file)
+                yaml_data = yaml.load(file, Loader=SafeLoader)
             
             # 添加元数据
             if yaml_data is None:
@@ -136,7 +159,7 @@ class YAMLConfigManager:
             }
             
             # 验证配置
-            config = SimulationConfigModel(**yaml_data)
+            config = SimulationConfigModel.model_validate(yaml_data)
             return config
             
         except yaml.YAMLError as e:
@@ -168,6 +191,14 @@ class YAMLConfigManager:
             with open(config_path, 'w', encoding='utf-8') as file:
                 file.write(yaml_content)
             
+            # 同步更新摘要索引
+            self._write_summary(config_file, {
+                'name': config.simulation.name,
+                'location': config.simulation.location,
+                'vehicles': config.vehicles.count,
+                'duration': config.simulation.duration
+            })
+            
             return True
             
         except Exception as e:
@@ -185,6 +216,7 @@ class YAMLConfigManager:
         # 转换为YAML
         yaml_content = yaml.dump(
             config_dict,
+            Dumper=SafeDumper,
             default_flow_style=False,
             allow_unicode=True,
             indent=2,
@@ -193,10 +225,97 @@ class YAMLConfigManager:
         
         return header + yaml_content
     
+    def summarize(self, config_file: str) -> Dict[str, Any]:
+        """读取配置文件的摘要信息，仅解析YAML而不构建/验证配置模型
+        
+        优先读取 .meta/<文件名>.meta.json 摘要索引；索引缺失或与YAML文件的
+        mtime不一致时（旧文件或手动编辑过）重新解析YAML并写回索引。
+        
+        Args:
+            config_file: 配置文件名
+            
+        Returns:
+            包含name、location、vehicles、duration的字典，缺省字段取模型默认值
+            
+        Raises:
+            FileNotFoundError: 配置文件不存在
+            yaml.YAMLError: YAML解析错误
+        """
+        config_path = self.config_dir / config_file
+        mtime = config_path.stat().st_mtime_ns
+        
+        try:
+            meta = json.loads(self._summary_path(config_file).read_bytes())
+            if meta.get('mtime_ns') == mtime:
+                return meta['summary']
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        with open(config_path, 'r', encoding='utf-8') as file:
+            yaml_data = yaml.load(file, Loader=SafeLoader) or {}
+        
+        simulation = yaml_data.get('simulation') or {}
+        vehicles = yaml_data.get('vehicles') or {}
+        summary = {
+            'name': simulation.get('name', _DEFAULT_CONFIG.simulation.name),
+            'location': simulation.get('location', _DEFAULT_CONFIG.simulation.location),
+            'vehicles': vehicles.get('count', _DEFAULT_CONFIG.vehicles.count),
+            'duration': simulation.get('duration', _DEFAULT_CONFIG.simulation.duration)
+        }
+        self._write_summary(config_file, summary)
+        return summary
+    
+    def _summary_path(self, config_file: str) -> Path:
+        """摘要索引文件路径"""
+        return self.meta_dir / f"{config_file}.meta.json"
+    
+    def _write_summary(self, config_file: str, summary: Dict[str, Any]):
+        """写入摘要索引，记录对应YAML文件的mtime（索引只是缓存，写入失败可忽略）"""
+        try:
+            self.meta_dir.mkdir(exist_ok=True)
+            meta = {
+                'mtime_ns': (self.config_dir / config_file).stat().st_mtime_ns,
+                'summary': summary
+            }
+            self._summary_path(config_file).write_text(
+                json.dumps(meta, ensure_ascii=False), encoding='utf-8'
+            )
+        except OSError:
+            pass
+    
+    def delete_config(self, config_file: str):
+        """删除配置文件及其摘要索引
+        
+        Args:
+            config_file: 配置文件名
+            
+        Raises:
+            FileNotFoundError: 配置文件不存在
+        """
+        (self.config_dir / config_file).unlink()
+        self._summary_path(config_file).unlink(missing_ok=True)
+    
     def list_configs(self) -> List[str]:
         """列出所有可用的配置文件"""
-        yaml_files = list(self.config_dir.glob("*.yaml"))
-        return [f.name for f in yaml_files]
+        return self._list_yaml_files(self.config_dir)
+    
+    def list_templates(self) -> List[str]:
+        """列出所有配置模板文件"""
+        return self._list_yaml_files(self.templates_dir)
+    
+    def _list_yaml_files(self, directory: Path) -> List[str]:
+        """列出目录下的YAML文件，目录未变化时复用上次的扫描结果"""
+        mtime = directory.stat().st_mtime_ns
+        cached = self._listing_cache.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
+        
+        # scandir直接给出文件类型，不需要逐个stat
+        with os.scandir(directory) as entries:
+            names = [entry.name for entry in entries
+                     if entry.name.endswith('.yaml') and entry.is_file()]
+        self._listing_cache[directory] = (mtime, names)
+        return list(names)
     
     def create_template(self, template_name: str, base_config: Optional[SimulationConfigModel] = None) -> bool:
         """创建配置模板
@@ -238,9 +357,9 @@ class YAMLConfigManager:
             raise FileNotFoundError(f"模板不存在: {template_path}")
         
         with open(template_path, 'r', encoding='utf-8') as file:
-            yaml_data = yaml.safe_load(file)
+            yaml_data = yaml.load(file, Loader=SafeLoader)
         
-        return SimulationConfigModel(**yaml_data)
+        return SimulationConfigModel.model_validate(yaml_data)
     
     def convert_legacy_config(self, legacy_config: Dict) -> SimulationConfigModel:
         """将传统的字典配置转换为新的YAML配置格式
@@ -287,7 +406,8 @@ class YAMLConfigManager:
                     "enable_animation": legacy_config.get('enable_animation', True),
                     "animation_fps": legacy_config.get('animation_fps', 60),
                     "save_animation": legacy_config.get('save_animation', True),
-                    "animation_format": legacy_config.get('animation_format', 'html')
+                    "animation_format": legacy_config.get('animation_format', 'html'),
+                    "live_backend": legacy_config.get('live_backend', 'mpl')
                 },
                 "data": {
                     "save_data": legacy_config.get('save_data', False),
@@ -296,7 +416,7 @@ class YAMLConfigManager:
                 }
             }
             
-            return SimulationConfigModel(**converted_config)
+            return SimulationConfigModel.model_validate(converted_config)
             
         except Exception as e:
             print(f"转换传统配置失败: {e}")
@@ -345,6 +465,7 @@ class YAMLConfigManager:
             'show_preview': False,  # 固定值
             'save_animation': config.visualization.save_animation,
             'animation_format': config.visualization.animation_format,
+            'live_backend': config.visualization.live_backend,
             
             # 数据管理参数
             'save_data': config.data.save_data,
@@ -29,6 +29,7 @@ class ChargingManager:
         # Charging stations
         self.charging_stations: Dict[str, ChargingStation] = {}  # station_id -> ChargingStation
         self.node_to_station: Dict[int, str] = {}  # node_id -> station_id mapping
+        self._station_tuple: Tuple[ChargingStation, ...] = ()  # Stable snapshot returned by get_station_list
         
         # Charging parameters
         self.charging_rate = config.get('charging_rate', 1.0)  # %/second
@@ -62,6 +63,7 @@ class ChargingManager:
             self.charging_stations[station.station_id] = station
             self.node_to_station[node_id] = station.station_id
         
+        self._station_tuple = tuple(self.charging_stations.values())
         print(f"Initialized {len(self.charging_stations)} charging stations")
     
     # ============= Charging Station Search Methods =============
@@ -250,9 +252,11 @@ class ChargingManager:
             'avg_revenue_per_station': total_revenue / max(1, total_stations)
         }
     
-    def get_station_list(self) -> List[ChargingStation]:
-        """Get all charging station list"""
-        return list(self.charging_stations.values())
+    def get_station_list(self) -> Tuple[ChargingStation, ...]:
+        """Get all charging station list (the same tuple every call while stations are unchanged)"""
+        if len(self._station_tuple) != len(self.charging_stations):
+            self._station_tuple = tuple(self.charging_stations.values())
+        return self._station_tuple
     
     def get_busy_stations(self) -> List[ChargingStation]:
         """Get busy charging stations (utilization > 80%)"""
@@ -41,6 +41,9 @@ class MapManager:
         self._node_positions_latlon = {}  # 添加经纬度坐标缓存
         self._cache_node_positions()
         
+        # Projected -> WGS84 transformer, created on first batch conversion
+        self._latlon_transformer = None
+        
         # Graphics objects (for visualization)
         self.fig = None
         self.ax = None
@@ -118,6 +121,33 @@ class MapManager:
             # Fallback: find nearest node and use its lat/lon
             return self.find_nearest_node_latlon(projected_pos)
     
+    def projected_to_latlon_batch(self, projected_positions: np.ndarray) -> np.ndarray:
+        """
+        Convert many projected coordinates to lat/lon in one transform call
+        
+        Args:
+            projected_positions: (K, 2) array of (x, y) in projected coordinates (meters)
+            
+        Returns:
+            (K, 2) array of (longitude, latitude) in WGS84 degrees
+        """
+        projected_positions = np.asarray(projected_positions, dtype=np.float64).reshape(-1, 2)
+        if len(projected_positions) == 0:
+            return projected_positions
+        try:
+            if self._latlon_transformer is None:
+                from pyproj import Transformer
+                self._latlon_transformer = Transformer.from_crs(
+                    self.projected_graph.graph['crs'], 'EPSG:4326', always_xy=True
+                )
+            lons, lats = self._latlon_transformer.transform(
+                projected_positions[:, 0], projected_positions[:, 1]
+            )
+            return np.column_stack((lons, lats))
+        except:
+            # Fallback: convert point by point
+            return np.array([self.projected_to_latlon(tuple(pos)) for pos in projected_positions], dtype=np.float64)
+    
     def latlon_to_projected(self, latlon_pos: Tuple[float, float]) -> Tuple[float, float]:
         """
         Convert lat/lon coordinates to projected coordinates
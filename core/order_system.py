@@ -30,6 +30,7 @@ class OrderSystem:
         # Order storage
         self.orders: Dict[str, Order] = {}  # order_id -> Order
         self.pending_orders: List[str] = []  # List of pending order IDs
+        self.orders_version = 0  # Bumped whenever an order is created, completed or cancelled
         
         # Statistics
         self.total_orders_created = 0
@@ -69,6 +70,7 @@ class OrderSystem:
                 self.orders[order.order_id] = order
                 self.pending_orders.append(order.order_id)
                 self.total_orders_created += 1
+                self.orders_version += 1
                 orders_generated += 1
         
         print(f"Pre-generated {orders_generated} initial orders")
@@ -96,6 +98,7 @@ class OrderSystem:
                 self.orders[order.order_id] = order
                 self.pending_orders.append(order.order_id)
                 self.total_orders_created += 1
+                self.orders_version += 1
                 new_orders.append(order)
         
         return new_orders
@@ -290,6 +293,7 @@ class OrderSystem:
         
         # Update statistics
         self.total_orders_completed += 1
+        self.orders_version += 1
         self.total_revenue += order.final_price
         
         # Update vehicle statistics
@@ -314,6 +318,7 @@ class OrderSystem:
             self.pending_orders.remove(order_id)
         
         self.total_orders_cancelled += 1
+        self.orders_version += 1
     
     # ============= Order Management Methods =============
     def check_and_cancel_timeout_orders(self, current_time: float):
@@ -4,7 +4,8 @@ Coordinates all subsystems, manages simulation flow, and handles business logic
 """
 
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
+import numpy as np
 from core.map_manager import MapManager
 from core.vehicle_manager import VehicleManager
 from core.order_system import OrderSystem
@@ -293,10 +294,14 @@ class SimulationEngine:
         return stats
     
     # ============= Data Access Methods =============
-    def get_vehicles(self) -> List[Vehicle]:
-        """Get all vehicles"""
+    def get_vehicles(self) -> Tuple[Vehicle, ...]:
+        """Get all vehicles (cached tuple, not rebuilt per call)"""
         return self.vehicle_manager.get_all_vehicles()
     
+    def vehicle_state_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get vehicle positions, status codes and battery levels as arrays"""
+        return self.vehicle_manager.get_state_arrays()
+    
     def get_orders(self) -> Dict:
         """Get order information"""
         return {
@@ -304,6 +309,10 @@ class SimulationEngine:
             'active': self.order_system.get_active_orders()
         }
     
+    def orders_version(self) -> int:
+        """Get a counter that changes whenever the set of open orders changes"""
+        return self.order_system.orders_version
+    
     def get_charging_stations(self):
         """Get charging station list"""
         return self.charging_manager.get_station_list()
\ No newline at end of file
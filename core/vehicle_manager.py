@@ -9,7 +9,7 @@ import numpy as np
 from typing import List, Dict, Optional, Tuple
 from models.vehicle import Vehicle
 from core.map_manager import MapManager
-from config.simulation_config import VEHICLE_STATUS
+from config.simulation_config import VEHICLE_STATUS, VEHICLE_STATUS_CODES, UNKNOWN_STATUS_CODE
 from utils.geometry import calculate_distance, calculate_direction_to_target, is_point_near_target
 
 
@@ -29,6 +29,12 @@ class VehicleManager:
         
         # Vehicle storage
         self.vehicles: Dict[str, Vehicle] = {}  # vehicle_id -> Vehicle
+        self._vehicle_tuple: Tuple[Vehicle, ...] = ()  # Stable snapshot returned by get_all_vehicles
+        
+        # Reusable structure-of-arrays view of vehicle state (see get_state_arrays)
+        self._positions = np.zeros((0, 2), dtype=np.float64)
+        self._status_codes = np.zeros(0, dtype=np.int8)
+        self._battery_percentages = np.zeros(0, dtype=np.float32)
         
         # Speed parameters
         self.vehicle_speed = config.get('vehicle_speed_mps', 50/3.6)  # m/s
@@ -60,6 +66,7 @@ class VehicleManager:
             
             self.vehicles[vehicle_id] = vehicle
         
+        self._vehicle_tuple = tuple(self.vehicles.values())
         print(f"Initialized {len(self.vehicles)} vehicles")
     
     # ============= Vehicle Update Methods =============
@@ -145,9 +152,37 @@ class VehicleManager:
             pass
     
     # ============= Vehicle Getter Methods =============
-    def get_all_vehicles(self) -> List[Vehicle]:
-        """Get all vehicles"""
-        return list(self.vehicles.values())
+    def get_all_vehicles(self) -> Tuple[Vehicle, ...]:
+        """Get all vehicles (the same tuple every call while the fleet is unchanged)"""
+        if len(self._vehicle_tuple) != len(self.vehicles):
+            self._vehicle_tuple = tuple(self.vehicles.values())
+        return self._vehicle_tuple
+    
+    def get_state_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get vehicle state as contiguous arrays, one row per vehicle
+        
+        Rows follow get_all_vehicles() order. The arrays are reused between
+        calls, so copy them if they must outlive the next call.
+        
+        Returns:
+            (positions (N, 2) float64, status codes (N,) int8 from
+            VEHICLE_STATUS_CODES, battery percentages (N,) float32)
+        """
+        vehicles = self.vehicles.values()
+        num_vehicles = len(self.vehicles)
+        if self._positions.shape[0] != num_vehicles:
+            self._positions = np.zeros((num_vehicles, 2), dtype=np.float64)
+            self._status_codes = np.zeros(num_vehicles, dtype=np.int8)
+            self._battery_percentages = np.zeros(num_vehicles, dtype=np.float32)
+        
+        if num_vehicles:
+            status_code = VEHICLE_STATUS_CODES.get
+            self._positions[:] = [v.position for v in vehicles]
+            self._status_codes[:] = [status_code(v.status, UNKNOWN_STATUS_CODE) for v in vehicles]
+            self._battery_percentages[:] = [v.battery_percentage for v in vehicles]
+        
+        return self._positions, self._status_codes, self._battery_percentages
     
     def get_vehicle_by_id(self, vehicle_id: str) -> Optional[Vehicle]:
         """Get vehicle by ID"""
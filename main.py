@@ -15,13 +15,17 @@ sys.path.append(str(Path(__file__).parent))
 
 def run_live_simulation(engine, yaml_config):
     """运行实时可视化仿真"""
-    from visualization.visualizer import Visualizer
-    
     print("🎨 初始化可视化系统...")
     # 转换为传统配置格式给Visualizer使用
     from config.yaml_config_manager import config_manager
     legacy_config = config_manager.to_legacy_format(yaml_config)
     
+    # 超大车队可选pyqtgraph后端（需要额外安装pyqtgraph和Qt）
+    if legacy_config.get('live_backend', 'mpl') == 'pyqtgraph':
+        from visualization.visualizer_pyqtgraph import PyQtGraphVisualizer as Visualizer
+    else:
+        from visualization.visualizer import Visualizer
+    
     visualizer = Visualizer(
         simulation_engine=engine,
         config=legacy_config
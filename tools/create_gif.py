@@ -17,7 +17,8 @@ def create_demo_gif(config_file="yaml_config/gif_demos/west_lafayette_high_densi
                    frames_dir="assets/frames",
                    max_frames=80,
                    frame_interval=3,
-                   duration=15):
+                   duration=15,
+                   fixed_palette=False):
     """
     Create a demo GIF with customizable options
     
@@ -29,6 +30,7 @@ def create_demo_gif(config_file="yaml_config/gif_demos/west_lafayette_high_densi
         max_frames: Maximum number of frames to capture
         frame_interval: Capture every N simulation steps
         duration: Simulation duration in seconds
+        fixed_palette: Skip per-frame palette optimization for faster encoding
     """
     print("🎬 EV Simulation GIF Creator")
     print("=" * 40)
@@ -51,6 +53,7 @@ def create_demo_gif(config_file="yaml_config/gif_demos/west_lafayette_high_densi
         legacy_config['gif_frame_interval'] = frame_interval
         legacy_config['gif_output_path'] = output_file
         legacy_config['gif_frame_duration'] = 150  # ms
+        legacy_config['gif_fixed_palette'] = fixed_palette
         
         # Frame management settings
         legacy_config['save_individual_frames'] = save_frames
@@ -119,6 +122,8 @@ Examples:
                        help='Capture every N simulation steps (default: 3)')
     parser.add_argument('--duration', type=float, default=15,
                        help='Simulation duration in seconds (default: 15)')
+    parser.add_argument('--fixed-palette', action='store_true',
+                       help='Write frames with the shared palette as-is (faster encode, larger file)')
     
     args = parser.parse_args()
     
@@ -130,7 +135,8 @@ Examples:
         frames_dir=args.frames_dir,
         max_frames=args.max_frames,
         frame_interval=args.frame_interval,
-        duration=args.duration
+        duration=args.duration,
+        fixed_palette=args.fixed_palette
     )
     
     return 0 if success else 1
@@ -5,9 +5,12 @@ Automatically captures frames during simulation and generates GIF
 
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+import numpy as np
 from PIL import Image
-import io
 import os
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 import time
@@ -15,6 +18,37 @@ import time
 from visualization.visualizer import Visualizer
 
 
+def _build_palette_332() -> List[int]:
+    """Build the flat 256-entry RGB palette for 3-3-2 frame indices"""
+    palette = []
+    for index in range(256):
+        palette.append(((index >> 5) & 0x07) * 255 // 7)  # red: 3 bits
+        palette.append(((index >> 2) & 0x07) * 255 // 7)  # green: 3 bits
+        palette.append((index & 0x03) * 255 // 3)         # blue: 2 bits
+    return palette
+
+
+# Fixed palette shared by every recorded frame
+PALETTE_332 = _build_palette_332()
+
+
+def _rgb_to_idx(arr: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Map an RGB(A) uint8 image to 3-3-2 palette indices in one vectorized pass"""
+    if out is None:
+        out = np.empty(arr.shape[:2], dtype=np.uint8)
+    np.bitwise_and(arr[:, :, 0], 0xE0, out=out)
+    out |= (arr[:, :, 1] >> 5) << 2
+    out |= arr[:, :, 2] >> 6
+    return out
+
+
+def _idx_to_image(indices: np.ndarray) -> Image.Image:
+    """Wrap a palette index array as a paletted PIL image"""
+    image = Image.fromarray(indices)  # 'L' image, becomes 'P' once the palette is attached
+    image.putpalette(PALETTE_332)
+    return image
+
+
 class GifRecorder(Visualizer):
     """Extended Visualizer that can record simulation as GIF"""
     
@@ -24,7 +58,7 @@ class GifRecorder(Visualizer):
         
         # Recording parameters
         self.recording = False
-        self.frames = []
+        self.frames = []  # uint8[h, w] palette index arrays
         self.max_frames = config.get('gif_max_frames', 150)  # Limit frames to keep file size reasonable
         self.frame_interval = config.get('gif_frame_interval', 5)  # Capture every N steps
         self.step_counter = 0
@@ -32,22 +66,62 @@ class GifRecorder(Visualizer):
         # Output settings
         self.output_path = config.get('gif_output_path', 'assets/demo-python-simulation.gif')
         self.gif_duration = config.get('gif_frame_duration', 200)  # ms per frame
+        # Write every frame with the shared 3-3-2 palette as-is, skipping Pillow's
+        # per-frame palette optimization pass (faster encode, slightly larger file)
+        self.gif_fixed_palette = config.get('gif_fixed_palette', False)
+        # Pace the preview so it plays at the GIF's speed; off = run as fast as possible
+        self.gif_preview_pacing = config.get('gif_preview_pacing', False)
         
         # Frame management options
         self.save_individual_frames = config.get('save_individual_frames', False)
         self.frames_dir = config.get('frames_output_dir', 'assets/frames')
         self.auto_cleanup = config.get('auto_cleanup_frames', True)
+        self._created_frames_dir = False  # Only a directory we created may be removed whole
+        # Frames that get cleaned up right away use the fastest zlib level
+        self.frame_png_compress_level = config.get(
+            'frame_png_compress_level', 1 if self.auto_cleanup else 6
+        )
+        
+        # Individual frames are written in batches by a background writer
+        self.frame_write_batch_size = config.get('frame_write_batch_size', 16)
+        self._pending_frame_writes = []
+        self._frame_writer = None
+        
+        # Free-list of frame buffers reused between captures and recordings
+        self._buf_pool = deque()
         
     def start_recording(self):
         """Start recording frames"""
         self.recording = True
-        self.frames = []
+        self._release_frames()
         self.step_counter = 0
+        
+        # Create the frames directory once instead of on every saved frame
+        if self.save_individual_frames:
+            frames_path = Path(self.frames_dir)
+            if not frames_path.exists():
+                frames_path.mkdir(parents=True)
+                self._created_frames_dir = True
+            self._frame_writer = ThreadPoolExecutor(max_workers=1)
+        
+        # Specialize capture_frame for this recording's fixed settings
+        self.capture_frame = self._make_capture()
+        
         print(f"🎬 Started GIF recording - will capture max {self.max_frames} frames")
         
     def stop_recording(self):
         """Stop recording and generate GIF"""
         self.recording = False
+        
+        # Write out the remaining frames and wait for the writer to finish
+        if self._frame_writer is not None:
+            self._flush_frame_writes()
+            self._frame_writer.shutdown(wait=True)
+            self._frame_writer = None
+        
+        # Restore the generic capture_frame method
+        self.__dict__.pop('capture_frame', None)
+        
         print(f"🎬 Stopped recording - captured {len(self.frames)} frames")
         
     def capture_frame(self):
@@ -55,17 +129,14 @@ class GifRecorder(Visualizer):
         if not self.recording or len(self.frames) >= self.max_frames:
             return
             
-        # Capture current figure
-        buf = io.BytesIO()
-        self.fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        
-        # Convert to PIL Image and load data immediately
-        frame = Image.open(buf)
-        frame.load()  # Load the image data into memory
+        # Read the canvas RGBA buffer directly (no PNG roundtrip); render only
+        # if the display loop has not already drawn the current frame
+        if self._canvas_dirty:
+            self._refresh_display()
+        rgba = np.asarray(self.fig.canvas.buffer_rgba())
         
-        # Now safe to close buffer
-        buf.close()
+        # Quantize to the fixed 3-3-2 palette (1 byte per pixel) into a pooled buffer
+        frame = _rgb_to_idx(rgba, out=self._acquire_buf(rgba.shape[0], rgba.shape[1]))
         
         # Save individual frame if requested
         if self.save_individual_frames:
@@ -74,25 +145,89 @@ class GifRecorder(Visualizer):
         # Store in memory for GIF creation
         self.frames.append(frame)
     
-    def _save_individual_frame(self, frame: Image.Image, frame_number: int):
-        """Save individual frame to disk"""
-        try:
-            # Ensure frames directory exists
-            frames_path = Path(self.frames_dir)
-            frames_path.mkdir(parents=True, exist_ok=True)
+    def _make_capture(self):
+        """
+        Build a capture function with this recording's settings bound as locals
+        
+        The figure canvas, buffer pool and save options are fixed for the duration
+        of a recording, so they are resolved once here instead of every frame.
+        """
+        canvas = self.fig.canvas
+        frames = self.frames
+        append_frame = frames.append
+        max_frames = self.max_frames
+        refresh_display = self._refresh_display
+        acquire_buf = self._acquire_buf
+        save_frame = self._save_individual_frame if self.save_individual_frames else None
+        
+        def capture_frame():
+            """Capture current matplotlib figure as frame"""
+            if len(frames) >= max_frames:
+                return
             
-            # Save frame with zero-padded number
-            frame_file = frames_path / f"frame_{frame_number:04d}.png"
-            frame.save(frame_file, format='PNG', optimize=True)
+            if self._canvas_dirty:
+                refresh_display()
+            rgba = np.asarray(canvas.buffer_rgba())
+            frame = _rgb_to_idx(rgba, out=acquire_buf(rgba.shape[0], rgba.shape[1]))
             
-        except Exception as e:
-            print(f"⚠️ Failed to save frame {frame_number}: {e}")
+            if save_frame is not None:
+                save_frame(frame, len(frames))
+            append_frame(frame)
+        
+        return capture_frame
+    
+    def _acquire_buf(self, height: int, width: int) -> np.ndarray:
+        """Get a frame buffer from the pool, allocating only when none fits"""
+        while self._buf_pool:
+            buf = self._buf_pool.pop()
+            if buf.shape == (height, width):
+                return buf
+        return np.empty((height, width), dtype=np.uint8)
+    
+    def _release_buf(self, buf: np.ndarray):
+        """Return a frame buffer to the pool"""
+        if len(self._buf_pool) < self.max_frames:
+            self._buf_pool.append(buf)
+    
+    def _release_frames(self):
+        """Return all recorded frame buffers to the pool and reset the frame list"""
+        for frame in self.frames:
+            self._release_buf(frame)
+        self.frames.clear()  # keep the list identity bound by _make_capture
+    
+    def _save_individual_frame(self, frame: np.ndarray, frame_number: int):
+        """Queue individual frame for a batched write to disk"""
+        # Zero-padded file name (directory created in start_recording)
+        frame_file = Path(self.frames_dir) / f"frame_{frame_number:04d}.png"
+        self._pending_frame_writes.append((frame_file, frame))
+        
+        if len(self._pending_frame_writes) >= self.frame_write_batch_size:
+            self._flush_frame_writes()
+    
+    def _flush_frame_writes(self):
+        """Hand the pending frames to the background writer as one batch"""
+        if not self._pending_frame_writes:
+            return
+        
+        batch = self._pending_frame_writes
+        self._pending_frame_writes = []
+        self._frame_writer.submit(self._write_frame_batch, batch)
+    
+    def _write_frame_batch(self, batch: List[tuple]):
+        """Encode and write a batch of frames (runs on the writer thread)"""
+        for frame_file, frame in batch:
+            try:
+                _idx_to_image(frame).save(
+                    frame_file, format='PNG', compress_level=self.frame_png_compress_level
+                )
+            except Exception as e:
+                print(f"⚠️ Failed to save frame {frame_file.name}: {e}")
     
     def cleanup_frames(self):
         """Clear frames from memory and optionally delete frame files"""
         # Clear memory
         memory_frames = len(self.frames)
-        self.frames.clear()
+        self._release_frames()
         
         if memory_frames > 0:
             print(f"🧹 Cleaned up {memory_frames} frames from memory")
@@ -101,7 +236,13 @@ class GifRecorder(Visualizer):
         if self.auto_cleanup and self.save_individual_frames:
             try:
                 frames_path = Path(self.frames_dir)
-                if frames_path.exists():
+                if self._created_frames_dir:
+                    # Our own directory holds only frames: remove it in one native traversal
+                    shutil.rmtree(frames_path)
+                    self._created_frames_dir = False
+                    print(f"🗑️ Removed frame files from {self.frames_dir}")
+                elif frames_path.exists():
+                    # Existing directory: remove only our frame files, keep anything else
                     frame_files = list(frames_path.glob("frame_*.png"))
                     for frame_file in frame_files:
                         frame_file.unlink()
@@ -130,7 +271,9 @@ class GifRecorder(Visualizer):
             
             for i, frame in enumerate(self.frames):
                 frame_file = export_path / f"frame_{i:04d}.png"
-                frame.save(frame_file, format='PNG', optimize=True)
+                _idx_to_image(frame).save(
+                    frame_file, format='PNG', compress_level=self.frame_png_compress_level
+                )
             
             print(f"✅ Frames exported successfully to {export_dir}")
             return True
@@ -152,14 +295,18 @@ class GifRecorder(Visualizer):
             
             print(f"💾 Saving GIF with {len(self.frames)} frames to {self.output_path}")
             
-            # Save as GIF
-            self.frames[0].save(
+            # Save as GIF - frames already share one palette, so no per-frame quantization.
+            # Pillow crops every frame after the first to the bounding box of pixels that
+            # changed; disposal=1 keeps the previous frame so those deltas composite on it.
+            images = [_idx_to_image(frame) for frame in self.frames]
+            images[0].save(
                 self.output_path,
                 save_all=True,
-                append_images=self.frames[1:],
+                append_images=images[1:],
                 duration=self.gif_duration,
                 loop=0,
-                optimize=True
+                disposal=1,
+                optimize=not self.gif_fixed_palette
             )
             
             # Get file size
@@ -200,37 +347,43 @@ class GifRecorder(Visualizer):
         plt.ion()
         plt.show()
         
-        # Start recording if auto mode
+        # Initialize display and cache the static map background
+        self._clear_dynamic_elements()
+        self._setup_blit()
+        
+        # Start recording if auto mode (after blit setup, which capture depends on)
         if auto_record:
             self.start_recording()
         
-        # Initialize display
-        self._clear_dynamic_elements()
+        # Wall-clock budget per step that matches GIF playback speed
+        step_budget = self.gif_duration / 1000.0 / max(1, self.frame_interval)
         
         try:
             while self.engine.current_time < duration and len(self.frames) < self.max_frames:
+                step_start = time.perf_counter()
+                
                 # Run simulation step
                 self.engine.run_step()
                 self.step_counter += 1
                 
-                # Update display
+                # Update display (only dynamic artists are redrawn when blitting)
                 self._update_live_display()
+                self._refresh_display()
                 
                 # Capture frame at intervals
                 if self.recording and self.step_counter % self.frame_interval == 0:
                     self.capture_frame()
                 
-                # Refresh display
-                self.fig.canvas.draw()
-                self.fig.canvas.flush_events()
-                
                 # Check if window was closed
-                if not plt.get_fignums():
+                if self._closed:
                     print("\n🛑 Window closed")
                     break
                 
-                # Fast simulation for GIF
-                plt.pause(0.01)
+                # Only sleep the remainder of the budget, never when already behind
+                if self.gif_preview_pacing:
+                    elapsed = time.perf_counter() - step_start
+                    if elapsed < step_budget:
+                        time.sleep(step_budget - elapsed)
                 
                 # Progress update
                 if self.step_counter % 50 == 0:
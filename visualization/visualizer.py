@@ -4,19 +4,51 @@ Real-time visualization of simulation process using matplotlib
 Provides live display without frame storage for efficient visualization
 """
 
-import matplotlib.pyplot as plt
-from matplotlib.patches import Circle
-import numpy as np
-from typing import List, Dict, Tuple, Optional
-from datetime import datetime
+import heapq
 import os
+import sys
+import threading
 import time
+from collections import deque
+from functools import lru_cache
+from datetime import datetime
+from typing import List, Dict, Tuple, Optional
+
+import matplotlib
+
+
+def _has_display() -> bool:
+    """Check whether a GUI display is available (only detectable on Linux)"""
+    if not sys.platform.startswith('linux'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+# Without a display, select the off-screen Agg backend before pyplot is used
+if not _has_display():
+    matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+import numpy as np
 
 from core.simulation_engine import SimulationEngine
 from models.vehicle import Vehicle
 from models.order import Order
 from models.charging_station import ChargingStation
-from config.simulation_config import COLORS, VEHICLE_STATUS, ORDER_STATUS
+from config.simulation_config import COLORS, VEHICLE_STATUS, VEHICLE_STATUS_CODES, ORDER_STATUS
+
+
+@lru_cache(maxsize=1024)
+def _battery_label(percent: int, status_code: int) -> str:
+    """Build a battery label (cached: only 101 percentages x a few statuses exist)"""
+    # Update battery text - changed to English
+    label = f"{percent}%"
+    if status_code == VEHICLE_STATUS_CODES[VEHICLE_STATUS['WITH_PASSENGER']]:
+        label += " P"  # Passenger
+    elif status_code == VEHICLE_STATUS_CODES[VEHICLE_STATUS['CHARGING']]:
+        label += " C"  # Charging
+    return label
 
 
 class Visualizer:
@@ -33,67 +65,161 @@ class Visualizer:
         self.engine = simulation_engine
         self.config = config
         
+        # Headless: render off-screen with Agg and skip all GUI work
+        self._headless = config.get('headless', False) or not _has_display()
+        if self._headless:
+            plt.switch_backend('Agg')
+        
         # Get map graphics
         self.fig, self.ax = self.engine.map_manager.setup_plot(
             show_preview=config.get('show_preview', False)
         )
         
+        # Static road network drawn once into a single image instead of
+        # re-stroking every edge segment whenever the background is redrawn
+        self._basemap_image = None
+        if config.get('raster_basemap', True):
+            self._rasterize_basemap()
+        
+        # Window close is tracked by callback instead of polling plt.get_fignums()
+        self._closed = False
+        self.fig.canvas.mpl_connect('close_event', self._on_close)
+        
         # Live visualization parameters
         self.fps = config.get('animation_fps', 30)
         
+        # Text layout is expensive: refresh labels every N steps, and skip
+        # per-vehicle battery labels entirely for large fleets
+        self._steps_per_frame = max(1, config.get('steps_per_frame', 1))  # Physics steps per redraw
+        self._text_update_every = max(1, config.get('text_update_every', 5))
+        self._label_vehicle_threshold = config.get('label_vehicle_threshold', 100)
+        
+        # Battery labels: with labels off, markers are colored by battery instead;
+        # with labels on, only the most interesting vehicles get one (charging first,
+        # then lowest battery) so the text count stays bounded
+        self._show_battery_labels = config.get('show_battery_labels', True)
+        self._max_battery_labels = max(1, config.get('max_battery_labels', 20))
+        self._step = 0
+        
+        # Statistics aggregation is O(vehicles + orders); reuse it for a short interval
+        self._stats_update_interval = config.get('stats_update_interval', 0.2)  # seconds
+        self._last_stats = None
+        self._last_stats_time = float('-inf')
+        
+        # Optional physics thread: the engine steps in the background and publishes
+        # the latest state snapshot; the UI thread renders whatever is newest
+        self._threaded_physics = config.get('threaded_physics', False)
+        self._latest = None
+        self._latest_lock = threading.Lock()
+        self._physics_error = None
+        
+        # Status code matching the rows of engine.vehicle_state_arrays()
+        self._charging_code = VEHICLE_STATUS_CODES[VEHICLE_STATUS['CHARGING']]
+        
         # Graphics element storage
-        self.vehicle_artists = {}  # vehicle_id -> {'marker': artist, 'text': artist}
-        self.order_markers = {}    # order_id -> {'pickup': artist, 'dropoff': artist}
-        self.station_markers = []  # Charging station markers
+        self.vehicle_scatter = None  # Single PathCollection holding every vehicle marker
+        self.vehicle_texts = []      # Pooled battery label artists
+        self.order_markers = {}    # order_id -> pooled slot {'pickup': artist, 'dropoff': artist, ...}
+        self._order_pool = []      # All order marker slots ever created
+        self._free_order_slots = deque()  # Hidden slots ready for reuse
+        self._last_orders_version = None  # engine.orders_version() the markers reflect
+        self.station_scatter = None  # Single PathCollection holding every charging station
         
         # Information text
         self.info_text = None
         self.stats_text = None
         
+        # Color lookup tables, resolved once so no color names are parsed per step:
+        # status code -> RGBA (last row for unknown statuses) and the low-battery override
+        self._status_palette = np.array(
+            [to_rgba(COLORS['vehicle'].get(status, 'gray')) for status in VEHICLE_STATUS_CODES]
+            + [to_rgba('gray')],
+            dtype=np.float32
+        )
+        self._low_battery_rgba = np.array(to_rgba(COLORS['low_battery']), dtype=np.float32)
+        
+        # Blitting state (static background raster + animated overlays)
+        self._blit_enabled = False
+        self._background = None
+        self._draw_cid = None
+        self._resize_cid = None
+        self._canvas_dirty = True  # artists changed since the canvas was last rendered
+        
         # Initialize graphics elements
         self._initialize_graphics()
     
     # ============= Initialization Methods =============
+    def _rasterize_basemap(self):
+        """Replace the vector road network with one pre-rendered AxesImage"""
+        canvas = self.fig.canvas
+        canvas.draw()
+        
+        # Crop the rendered axes area (buffer rows run top-down, bbox is bottom-up)
+        buffer = np.asarray(canvas.buffer_rgba())
+        x0, y0, x1, y1 = np.round(self.ax.bbox.extents).astype(int)
+        height = buffer.shape[0]
+        image = buffer[height - y1:height - y0, x0:x1].copy()
+        
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        for artist in list(self.ax.collections) + list(self.ax.lines):
+            artist.set_visible(False)
+        
+        self._basemap_image = self.ax.imshow(
+            image,
+            extent=(xlim[0], xlim[1], ylim[0], ylim[1]),
+            aspect=self.ax.get_aspect(),
+            interpolation='nearest',
+            zorder=0
+        )
+        self.ax.set_xlim(xlim)
+        self.ax.set_ylim(ylim)
+    
     def _initialize_graphics(self):
         """Initialize graphics elements"""
-        # Create vehicle graphics
-        for vehicle in self.engine.get_vehicles():
-            # Vehicle marker - increase size for better visibility
-            marker, = self.ax.plot(
-                [], [], 
-                marker='o', 
-                markersize=6,  # Increased from 3 to 6
-                color=COLORS['vehicle']['idle'],
-                markeredgecolor='black',
-                markeredgewidth=0.8
-            )
-            
-            # Battery text
-            text = self.ax.text(
-                0, 0, '', 
-                fontsize=8,  # Increased from 6 to 8
-                ha='center', 
-                va='bottom',
-                weight='bold'
-            )
-            
-            self.vehicle_artists[vehicle.vehicle_id] = {
-                'marker': marker,
-                'text': text
-            }
-        
-        # Create charging station graphics - increase size for better visibility
-        for station in self.engine.get_charging_stations():
-            marker, = self.ax.plot(
-                station.position[0], 
-                station.position[1],
-                marker='s',
-                markersize=8,  # Increased from 4 to 8
-                color=COLORS['charging_station'],
-                markeredgecolor='black',
-                markeredgewidth=1.2
-            )
-            self.station_markers.append(marker)
+        # Create vehicle graphics - all markers share one scatter (one draw call)
+        vehicles = self.engine.get_vehicles()
+        self.vehicle_scatter = self.ax.scatter(
+            [], [],
+            marker='o',
+            s=36,  # markersize 6 squared
+            edgecolors='black',
+            linewidths=0.8,
+            zorder=3
+        )
+        self._vehicle_rgba = np.zeros((len(vehicles), 4), dtype=np.float32)
+        
+        if not self._show_battery_labels:
+            # Battery hue replaces the labels: red (empty) to green (full)
+            self.vehicle_scatter.set_cmap('RdYlGn')
+            self.vehicle_scatter.set_clim(0, 100)
+        elif len(vehicles) <= self._label_vehicle_threshold:
+            # Battery text pool (skipped for large fleets)
+            for _ in range(min(len(vehicles), self._max_battery_labels)):
+                self.vehicle_texts.append(self.ax.text(
+                    0, 0, '', 
+                    fontsize=8,  # Increased from 6 to 8
+                    ha='center', 
+                    va='bottom',
+                    weight='bold'
+                ))
+        
+        # Create charging station graphics - one scatter for all stations
+        stations = self.engine.get_charging_stations()
+        station_positions = np.array([station.position for station in stations]).reshape(-1, 2)
+        self.station_scatter = self.ax.scatter(
+            station_positions[:, 0],
+            station_positions[:, 1],
+            marker='s',
+            s=64,  # markersize 8 squared
+            c=COLORS['charging_station'],
+            edgecolors='black',
+            linewidths=1.2,
+            zorder=2
+        )
+        
+        # Pre-allocate hidden order marker slots, reused as orders come and go
+        for _ in range(self.config.get('max_active_orders', 50)):
+            self._free_order_slots.append(self._create_order_slot())
         
         # Create information text - repositioned to avoid overlap
         self.info_text = self.ax.text(
@@ -130,291 +256,573 @@ class Visualizer:
         print("💡 Close window or press Ctrl+C to stop simulation")
         print("=" * 50)
         
-        # Enable interactive mode
-        plt.ion()
-        plt.show()
-        
-        # Initialize display
-        self._clear_dynamic_elements()
+        if not self._headless:
+            # Enable interactive mode
+            plt.ion()
+            plt.show()
+            
+            # Initialize display and cache the static map background
+            self._clear_dynamic_elements()
+            self._setup_blit()
         
         start_time = time.time()
         step_count = 0
-        update_interval = 1.0 / self.fps  # Update interval
+        next_progress_step = 100
+        frame_interval = 1.0 / self.fps * 0.2  # Speed up by 5x!
+        next_frame = time.monotonic()
         
         try:
-            while self.engine.current_time < duration:
-                step_start = time.time()
+            if self._headless:
+                # No display: advance the simulation without any drawing
+                self._run_headless_steps(duration)
+            elif self._threaded_physics:
+                # Physics in a background thread, rendering at self.fps here
+                self._run_threaded_simulation(duration)
+            else:
+                while self.engine.current_time < duration:
+                    # Run a batch of simulation steps per displayed frame
+                    for _ in range(self._steps_per_frame):
+                        if self.engine.current_time >= duration:
+                            break
+                        self.engine.run_step()
+                        step_count += 1
+                
+                    # Update display (only dynamic artists are redrawn when blitting)
+                    self._update_live_display()
+                    self._refresh_display()
                 
-                # Run one simulation step
-                self.engine.run_step()
-                step_count += 1
+                    # Check if window was closed
+                    if self._closed:
+                        print("\n🛑 Window closed, stopping simulation")
+                        break
                 
-                # Update display
-                self._update_live_display()
+                    # Sleep until the next frame deadline; when behind, skip the
+                    # sleep and re-anchor instead of trying to catch up
+                    next_frame += frame_interval
+                    sleep_for = next_frame - time.monotonic()
+                    if sleep_for > 0:
+                        time.sleep(sleep_for)
+                    else:
+                        next_frame = time.monotonic()
+                
+                    # Periodic progress output
+                    if step_count >= next_progress_step:
+                        next_progress_step += 100
+                        progress = (self.engine.current_time / duration) * 100
+                        print(f"Simulation progress: {progress:.1f}% (Time: {self.engine.current_time:.1f}s)")
+        
+        except KeyboardInterrupt:
+            print("\n🛑 User interrupted simulation")
+        
+        except Exception as e:
+            print(f"\n❌ Error during simulation: {e}")
+        
+        finally:
+            # Display final statistics (built once, written in a single call)
+            final_stats = self.engine.get_final_statistics()
+            sys.stdout.write(self._format_final_report(final_stats))
+            
+            # Keep window open for user to view final results
+            if not self._headless:
+                print("\n💡 Close window to exit")
+                plt.ioff()
+                plt.show()
+            
+            # Return final_stats for unified saving in main.py
+            return final_stats
+    
+    def _run_headless_steps(self, duration: float):
+        """Run simulation steps in a tight loop with no per-step drawing"""
+        step_count = 0
+        while self.engine.current_time < duration:
+            self.engine.run_step()
+            step_count += 1
+            
+            # Periodic progress output
+            if step_count % 100 == 0:
+                progress = (self.engine.current_time / duration) * 100
+                print(f"Simulation progress: {progress:.1f}% (Time: {self.engine.current_time:.1f}s)")
+    
+    def _run_threaded_simulation(self, duration: float):
+        """Render snapshots published by a background physics thread"""
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=self._physics_worker, args=(duration, stop),
+            name='physics', daemon=True
+        )
+        worker.start()
+        
+        frame_interval = 1.0 / self.fps
+        next_frame = time.monotonic()
+        try:
+            while worker.is_alive() or self._latest is not None:
+                # Latest-wins: intermediate snapshots are simply dropped
+                with self._latest_lock:
+                    snapshot, self._latest = self._latest, None
                 
-                # Refresh graphics
-                self.fig.canvas.draw()
-                self.fig.canvas.flush_events()
+                if snapshot is not None:
+                    self._update_live_display(snapshot)
+                    self._refresh_display()
+                else:
+                    self.fig.canvas.flush_events()  # Keep the window responsive
                 
                 # Check if window was closed
-                if not plt.get_fignums():
+                if self._closed:
                     print("\n🛑 Window closed, stopping simulation")
                     break
                 
-                # Control update frequency - much faster simulation speed!
-                elapsed = time.time() - step_start
-                target_interval = update_interval * 0.2  # Speed up by 5x! 
-                if elapsed < target_interval:
-                    plt.pause(target_interval - elapsed)
+                next_frame += frame_interval
+                sleep_for = next_frame - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    next_frame = time.monotonic()
+        finally:
+            stop.set()
+            worker.join()
+        
+        if self._physics_error is not None:
+            raise self._physics_error
+    
+    def _physics_worker(self, duration: float, stop: threading.Event):
+        """Step the engine and publish state snapshots (runs in the physics thread)"""
+        step_count = 0
+        next_progress_step = 100
+        batch_interval = 1.0 / self.fps * 0.2  # Same simulation pace as the single-threaded loop
+        next_batch = time.monotonic()
+        try:
+            while not stop.is_set() and self.engine.current_time < duration:
+                for _ in range(self._steps_per_frame):
+                    if self.engine.current_time >= duration:
+                        break
+                    self.engine.run_step()
+                    step_count += 1
+                
+                snapshot = self._snapshot_state()
+                with self._latest_lock:
+                    self._latest = snapshot
+                
+                next_batch += batch_interval
+                sleep_for = next_batch - time.monotonic()
+                if sleep_for > 0:
+                    stop.wait(sleep_for)
                 else:
-                    plt.pause(0.001)  # Give GUI some time to respond
+                    next_batch = time.monotonic()
                 
                 # Periodic progress output
-                if step_count % 100 == 0:
+                if step_count >= next_progress_step:
+                    next_progress_step += 100
                     progress = (self.engine.current_time / duration) * 100
                     print(f"Simulation progress: {progress:.1f}% (Time: {self.engine.current_time:.1f}s)")
+        except Exception as e:
+            self._physics_error = e
+    
+    def _snapshot_state(self) -> Dict:
+        """
+        Copy everything the display needs out of the engine
         
-        except KeyboardInterrupt:
-            print("\n🛑 User interrupted simulation")
+        Called from the physics thread so the UI thread never reads engine
+        state while a step is in progress.
+        """
+        positions, status_codes, batteries = self.engine.vehicle_state_arrays()
+        orders_info = self.engine.get_orders()
         
-        except Exception as e:
-            print(f"\n❌ Error during simulation: {e}")
+        # Statistics are rate-limited here rather than in _update_info_text
+        now = time.monotonic()
+        if self._last_stats is None or now - self._last_stats_time >= self._stats_update_interval:
+            self._last_stats = self.engine.get_current_statistics()
+            self._last_stats_time = now
         
-        finally:
-            # Display final statistics
-            final_stats = self.engine.get_final_statistics()
-            print("\n" + "=" * 60)
-            print("📊 SIMULATION COMPLETED - FINAL STATISTICS")
-            print("=" * 60)
+        return {
+            'vehicles': (positions.copy(), status_codes.copy(), batteries.copy()),
+            'orders': orders_info['pending'] + orders_info['active'],
+            'orders_version': self.engine.orders_version(),
+            'stats': self._last_stats
+        }
+    
+    def _format_final_report(self, final_stats: Dict) -> str:
+        """Format the end-of-simulation statistics report"""
+        summary = final_stats.get('summary', {})
+        orders = final_stats.get('orders', {})
+        vehicles = final_stats.get('vehicles', {})
+        charging = final_stats.get('charging', {})
+        
+        current_time = self.engine.current_time
+        revenue = summary.get('total_revenue', 0)
+        profit = summary.get('total_profit', 0)
+        total_orders = orders.get('total_orders_completed', 0)
+        sim_time_hours = current_time / 3600
+        
+        lines = [
+            "\n" + "=" * 60,
+            "📊 SIMULATION COMPLETED - FINAL STATISTICS",
+            "=" * 60,
             
             # Basic simulation info
-            print(f"\n🕒 SIMULATION SUMMARY:")
-            print(f"   Total simulation time: {self.engine.current_time:.1f} seconds")
-            print(f"   Total simulation steps: {self.engine.statistics['total_steps']}")
+            "\n🕒 SIMULATION SUMMARY:",
+            f"   Total simulation time: {current_time:.1f} seconds",
+            f"   Total simulation steps: {self.engine.statistics['total_steps']}",
             
             # Financial statistics
-            summary = final_stats.get('summary', {})
-            print(f"\n💰 FINANCIAL PERFORMANCE:")
-            print(f"   Total revenue: ${summary.get('total_revenue', 0):.2f}")
-            print(f"   Total cost: ${summary.get('total_cost', 0):.2f}")
-            print(f"   Total profit: ${summary.get('total_profit', 0):.2f}")
-            revenue = summary.get('total_revenue', 0)
-            profit = summary.get('total_profit', 0)
-            print(f"   Profit margin: {(profit/revenue*100) if revenue > 0 else 0:.1f}%")
+            "\n💰 FINANCIAL PERFORMANCE:",
+            f"   Total revenue: ${revenue:.2f}",
+            f"   Total cost: ${summary.get('total_cost', 0):.2f}",
+            f"   Total profit: ${profit:.2f}",
+            f"   Profit margin: {(profit/revenue*100) if revenue > 0 else 0:.1f}%",
             
             # Order statistics
-            orders = final_stats.get('orders', {})
-            print(f"\n📋 ORDER STATISTICS:")
-            print(f"   Total orders completed: {orders.get('total_orders_completed', 0)}")
-            print(f"   Total orders generated: {orders.get('total_orders_generated', 0)}")
-            print(f"   Order completion rate: {summary.get('order_completion_rate', 0)*100:.1f}%")
-            print(f"   Average order value: ${orders.get('avg_order_value', 0):.2f}")
-            print(f"   Average waiting time: {orders.get('avg_waiting_time', 0):.1f} seconds")
+            "\n📋 ORDER STATISTICS:",
+            f"   Total orders completed: {total_orders}",
+            f"   Total orders generated: {orders.get('total_orders_generated', 0)}",
+            f"   Order completion rate: {summary.get('order_completion_rate', 0)*100:.1f}%",
+            f"   Average order value: ${orders.get('avg_order_value', 0):.2f}",
+            f"   Average waiting time: {orders.get('avg_waiting_time', 0):.1f} seconds",
             
             # Vehicle statistics
-            vehicles = final_stats.get('vehicles', {})
-            print(f"\n🚗 VEHICLE FLEET STATISTICS:")
-            print(f"   Total vehicles: {vehicles.get('total_vehicles', 0)}")
-            print(f"   Average battery level: {vehicles.get('avg_battery_percentage', 0):.1f}%")
-            print(f"   Fleet utilization rate: {summary.get('vehicle_utilization_rate', 0)*100:.1f}%")
-            print(f"   Total distance traveled: {vehicles.get('total_distance_traveled', 0):.1f} km")
-            print(f"   Average distance per vehicle: {vehicles.get('avg_distance_per_vehicle', 0):.1f} km")
+            "\n🚗 VEHICLE FLEET STATISTICS:",
+            f"   Total vehicles: {vehicles.get('total_vehicles', 0)}",
+            f"   Average battery level: {vehicles.get('avg_battery_percentage', 0):.1f}%",
+            f"   Fleet utilization rate: {summary.get('vehicle_utilization_rate', 0)*100:.1f}%",
+            f"   Total distance traveled: {vehicles.get('total_distance_traveled', 0):.1f} km",
+            f"   Average distance per vehicle: {vehicles.get('avg_distance_per_vehicle', 0):.1f} km",
             
             # Charging statistics
-            charging = final_stats.get('charging', {})
-            print(f"\n🔋 CHARGING INFRASTRUCTURE:")
-            print(f"   Total charging stations: {charging.get('total_stations', 0)}")
-            print(f"   Average utilization rate: {summary.get('charging_utilization_rate', 0)*100:.1f}%")
-            print(f"   Total charging sessions: {charging.get('total_charging_sessions', 0)}")
-            print(f"   Total energy consumed: {charging.get('total_energy_consumed', 0):.1f} kWh")
-            
-            # Detailed vehicle performance (top 5 performers)
-            if 'vehicle_details' in final_stats and final_stats['vehicle_details']:
-                vehicle_details = final_stats['vehicle_details']
-                # Sort by total revenue
-                sorted_vehicles = sorted(vehicle_details, key=lambda x: x.get('total_revenue', 0), reverse=True)
-                
-                print(f"\n🏆 TOP PERFORMING VEHICLES:")
-                for i, vehicle in enumerate(sorted_vehicles[:5]):
-                    vehicle_id = vehicle.get('vehicle_id', f'Unknown_{i}')
-                    print(f"   #{i+1}: Vehicle {vehicle_id[-6:] if len(vehicle_id) > 6 else vehicle_id}")
-                    print(f"       Revenue: ${vehicle.get('total_revenue', 0):.2f}")
-                    print(f"       Orders completed: {vehicle.get('orders_completed', 0)}")
-                    print(f"       Distance traveled: {vehicle.get('total_distance', 0):.1f} km")
-                    print(f"       Battery cycles: {vehicle.get('charging_cycles', 0)}")
-            
-            # Performance metrics
-            print(f"\n📊 PERFORMANCE METRICS:")
-            total_revenue = summary.get('total_revenue', 0)
-            total_orders = orders.get('total_orders_completed', 0)
-            sim_time_hours = self.engine.current_time / 3600
-            
-            if total_revenue > 0 and sim_time_hours > 0:
-                print(f"   Revenue per hour: ${total_revenue / sim_time_hours:.2f}")
-                print(f"   Orders per hour: {total_orders / sim_time_hours:.1f}")
-            print(f"   Average vehicle efficiency: {vehicles.get('avg_efficiency', 0):.2f} km/kWh")
-            
-            print("=" * 60)
-            print("📈 Simulation data is available in the final_stats object")
-            print("💾 Use --save-data flag to export detailed reports and CSV files")
-            
-            # Keep window open for user to view final results
-            print("\n💡 Close window to exit")
-            plt.ioff()
-            plt.show()
+            "\n🔋 CHARGING INFRASTRUCTURE:",
+            f"   Total charging stations: {charging.get('total_stations', 0)}",
+            f"   Average utilization rate: {summary.get('charging_utilization_rate', 0)*100:.1f}%",
+            f"   Total charging sessions: {charging.get('total_charging_sessions', 0)}",
+            f"   Total energy consumed: {charging.get('total_energy_consumed', 0):.1f} kWh",
+        ]
+        
+        # Detailed vehicle performance (top 5 performers by revenue, partial sort)
+        vehicle_details = final_stats.get('vehicle_details')
+        if vehicle_details:
+            top_vehicles = heapq.nlargest(5, vehicle_details, key=lambda x: x.get('total_revenue', 0))
             
-            # Return final_stats for unified saving in main.py
-            return final_stats
+            lines.append("\n🏆 TOP PERFORMING VEHICLES:")
+            for i, vehicle in enumerate(top_vehicles):
+                vehicle_id = vehicle.get('vehicle_id', f'Unknown_{i}')
+                lines.append(f"   #{i+1}: Vehicle {vehicle_id[-6:] if len(vehicle_id) > 6 else vehicle_id}")
+                lines.append(f"       Revenue: ${vehicle.get('total_revenue', 0):.2f}")
+                lines.append(f"       Orders completed: {vehicle.get('orders_completed', 0)}")
+                lines.append(f"       Distance traveled: {vehicle.get('total_distance', 0):.1f} km")
+                lines.append(f"       Battery cycles: {vehicle.get('charging_cycles', 0)}")
+        
+        # Performance metrics
+        lines.append("\n📊 PERFORMANCE METRICS:")
+        if revenue > 0 and sim_time_hours > 0:
+            lines.append(f"   Revenue per hour: ${revenue / sim_time_hours:.2f}")
+            lines.append(f"   Orders per hour: {total_orders / sim_time_hours:.1f}")
+        lines.append(f"   Average vehicle efficiency: {vehicles.get('avg_efficiency', 0):.2f} km/kWh")
+        
+        lines.append("=" * 60)
+        lines.append("📈 Simulation data is available in the final_stats object")
+        lines.append("💾 Use --save-data flag to export detailed reports and CSV files")
+        
+        return "\n".join(lines) + "\n"
     
     def _clear_dynamic_elements(self):
         """Clear dynamic display elements"""
         # Clear vehicle displays
-        for vehicle_id, artists in self.vehicle_artists.items():
-            artists['marker'].set_data([], [])
-            artists['text'].set_text('')
-        
-        # Clear order markers
-        for order_id, markers in self.order_markers.items():
-            if 'pickup' in markers:
-                markers['pickup'].remove()
-            if 'dropoff' in markers:
-                markers['dropoff'].remove()
-            if 'pickup_text' in markers:
-                markers['pickup_text'].remove()
-            if 'dropoff_text' in markers:
-                markers['dropoff_text'].remove()
+        self.vehicle_scatter.set_offsets(np.empty((0, 2)))
+        for text in self.vehicle_texts:
+            text.set_text('')
+        
+        # Return order markers to the pool
+        for slot in self.order_markers.values():
+            self._release_order_slot(slot)
         self.order_markers.clear()
+        self._last_orders_version = None
         
         # Clear info text
         self.info_text.set_text('')
         self.stats_text.set_text('')
     
-    def _update_live_display(self):
-        """Update live display"""
-        # Update vehicles
-        self._update_vehicles()
+    def _update_live_display(self, snapshot: Optional[Dict] = None):
+        """
+        Update live display
+        
+        Args:
+            snapshot: State published by the physics thread; read from the engine if None
+        """
+        update_text = self._step % self._text_update_every == 0
+        self._step += 1
+        
+        if snapshot is None:
+            snapshot = {}
+        
+        # Update vehicles (markers every step, labels at the text cadence)
+        self._update_vehicles(update_labels=update_text, state=snapshot.get('vehicles'))
         
         # Update orders
-        self._update_orders()
+        self._update_orders(snapshot.get('orders'), snapshot.get('orders_version'))
         
         # Update info text
-        self._update_info_text()
+        if update_text:
+            self._update_info_text(snapshot.get('stats'))
+        
+        self._canvas_dirty = True
 
+    def _on_close(self, event):
+        """Remember that the figure window was closed"""
+        self._closed = True
+    
+    # ============= Blitting Methods =============
+    def _iter_dynamic_artists(self):
+        """Iterate over all artists that change between frames"""
+        yield self.vehicle_scatter
+        yield from self.vehicle_texts
+        for markers in self.order_markers.values():
+            yield from markers.values()
+        yield self.info_text
+        yield self.stats_text
+    
+    def _setup_blit(self) -> bool:
+        """
+        Mark dynamic artists as animated and cache the static map background
+        
+        Returns:
+            Whether blitting is supported by the current canvas
+        """
+        canvas = self.fig.canvas
+        if not getattr(canvas, 'supports_blit', False):
+            self._blit_enabled = False
+            return False
+        
+        self._blit_enabled = True
+        for artist in self._iter_dynamic_artists():
+            artist.set_animated(True)
+        for slot in self._order_pool:
+            for artist in slot.values():
+                artist.set_animated(True)
+        
+        # Every full draw (first frame, resize, zoom) re-captures the background
+        if self._draw_cid is None:
+            self._draw_cid = canvas.mpl_connect('draw_event', self._on_draw)
+            self._resize_cid = canvas.mpl_connect('resize_event', self._on_resize)
+        
+        # Full render once without the animated artists, then keep the raster
+        canvas.draw()
+        return True
+    
+    def _on_draw(self, event):
+        """Re-capture the static background after a full canvas draw"""
+        if not self._blit_enabled:
+            return
+        self._background = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_dynamic_artists()
+    
+    def _on_resize(self, event):
+        """Mark the cached background stale; the next frame requests a full redraw"""
+        self._background = None
+    
+    def _draw_dynamic_artists(self):
+        """Render the animated artists into the canvas buffer"""
+        for artist in self._iter_dynamic_artists():
+            self.ax.draw_artist(artist)
+    
+    def _blit_frame(self):
+        """Redraw only the dynamic artists on top of the cached background"""
+        canvas = self.fig.canvas
+        if self._background is None:
+            # Cold path (after a resize): let matplotlib coalesce one full redraw;
+            # the draw_event handler re-captures the background and draws overlays
+            canvas.draw_idle()
+            canvas.flush_events()
+            return
+        
+        canvas.restore_region(self._background)
+        self._draw_dynamic_artists()
+        canvas.blit(self.ax.bbox)
+        canvas.flush_events()
+    
+    def _refresh_display(self):
+        """Push the current frame to the screen (blit when available)"""
+        if self._blit_enabled:
+            self._blit_frame()
+        else:
+            # draw_idle coalesces redraw requests; flush_events runs the pending draw
+            self.fig.canvas.draw_idle()
+            self.fig.canvas.flush_events()
+        self._canvas_dirty = False
+    
     # ============= Legacy Animation Methods (REMOVED) =============
     # init_animation() and update_frame() methods have been removed
     # These were used for traditional frame-based animation generation
     
-    def _update_vehicles(self):
+    def _update_vehicles(self, update_labels: bool = True,
+                         state: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None):
         """Update vehicle display"""
-        vehicles = self.engine.get_vehicles()
+        if state is None:
+            state = self.engine.vehicle_state_arrays()
+        positions, status_codes, batteries = state
         
-        for vehicle in vehicles:
-            if vehicle.vehicle_id not in self.vehicle_artists:
-                continue
-            
-            artists = self.vehicle_artists[vehicle.vehicle_id]
-            
-            # Update position
-            artists['marker'].set_data([vehicle.position[0]], [vehicle.position[1]])
-            
-            # Update color
-            color = COLORS['vehicle'].get(vehicle.status, 'gray')
-            if vehicle.battery_percentage < 20:
-                color = COLORS['low_battery']
-            artists['marker'].set_color(color)
-            
-            # Update battery text - changed to English
-            battery_text = f"{vehicle.battery_percentage:.0f}%"
-            if vehicle.status == VEHICLE_STATUS['WITH_PASSENGER']:
-                battery_text += " P"  # Passenger
-            elif vehicle.status == VEHICLE_STATUS['CHARGING']:
-                battery_text += " C"  # Charging
-            
-            artists['text'].set_text(battery_text)
-            artists['text'].set_position((vehicle.position[0], vehicle.position[1] + 50))  # Increased offset back to 50
+        self.vehicle_scatter.set_offsets(positions)
+        if not self._show_battery_labels:
+            # Battery hue mode: the colormap does the coloring
+            self.vehicle_scatter.set_array(batteries)
+        else:
+            # Colors via table lookup plus a low-battery mask - no per-vehicle loop
+            rgba = self._vehicle_rgba
+            if rgba.shape[0] != status_codes.shape[0]:
+                rgba = self._vehicle_rgba = np.zeros((status_codes.shape[0], 4), dtype=np.float32)
+            np.take(self._status_palette, status_codes, axis=0, out=rgba)
+            rgba[batteries < 20] = self._low_battery_rgba
+            self.vehicle_scatter.set_facecolors(rgba)
+        
+        if update_labels and self.vehicle_texts:
+            self._update_vehicle_labels(positions, status_codes, batteries)
+    
+    def _update_vehicle_labels(self, positions: np.ndarray, status_codes: np.ndarray,
+                               batteries: np.ndarray):
+        """
+        Update pooled battery labels
+        
+        When the fleet outgrows the label pool, charging vehicles are labelled
+        first, followed by the lowest batteries.
+        """
+        texts = self.vehicle_texts
+        num_labels = len(texts)
+        if num_labels < len(batteries):
+            priority = np.where(status_codes == self._charging_code, -1.0, batteries)
+            rows = np.argpartition(priority, num_labels - 1)[:num_labels]
+        else:
+            rows = slice(None)
+        
+        # Pull the labelled rows out as Python scalars once instead of
+        # indexing numpy arrays element by element inside the loop
+        percents = np.rint(batteries[rows]).astype(np.int64).tolist()
+        codes = status_codes[rows].tolist()
+        xs = positions[rows, 0].tolist()
+        ys = (positions[rows, 1] + 50).tolist()  # Increased offset back to 50
+        
+        label = _battery_label
+        for text, percent, code, x, y in zip(texts, percents, codes, xs, ys):
+            text.set_text(label(percent, code))
+            text.set_position((x, y))
     
-    def _update_orders(self):
+    def _update_orders(self, active_orders: Optional[List[Order]] = None,
+                       orders_version: Optional[int] = None):
         """Update order display"""
-        orders_info = self.engine.get_orders()
+        # Nothing to do until an order is created, completed or cancelled
+        if orders_version is None:
+            orders_version = self.engine.orders_version()
+        if orders_version == self._last_orders_version:
+            return
+        self._last_orders_version = orders_version
         
-        # Get all active orders (pending and in progress)
-        active_orders = orders_info['pending'] + orders_info['active']
+        if active_orders is None:
+            # Get all active orders (pending and in progress)
+            orders_info = self.engine.get_orders()
+            active_orders = orders_info['pending'] + orders_info['active']
         
-        # Remove markers for completed orders
+        # Hide markers for completed orders and return their slots to the pool
         completed_order_ids = set(self.order_markers.keys()) - set(o.order_id for o in active_orders)
         for order_id in completed_order_ids:
-            if order_id in self.order_markers:
-                markers = self.order_markers[order_id]
-                if 'pickup' in markers:
-                    markers['pickup'].remove()
-                if 'dropoff' in markers:
-                    markers['dropoff'].remove()
-                if 'pickup_text' in markers:
-                    markers['pickup_text'].remove()
-                if 'dropoff_text' in markers:
-                    markers['dropoff_text'].remove()
-                del self.order_markers[order_id]
-        
-        # Update active orders
+            self._release_order_slot(self.order_markers.pop(order_id))
+        
+        # Show markers for new active orders using pooled artists
         for order in active_orders:
             if order.order_id not in self.order_markers:
-                # Create new markers
-                self.order_markers[order.order_id] = {}
+                slot = self._acquire_order_slot()
+                label = f"#{order.order_id[-3:]}"  # Show last 3 digits of order ID
                 
-                # Pickup point marker (triangle) - increase size for better visibility
-                pickup_marker, = self.ax.plot(
-                    order.pickup_position[0],
-                    order.pickup_position[1],
-                    marker='^',
-                    markersize=7,  # Increased from 4 to 7
-                    color=COLORS['order']['pickup'],
-                    markeredgecolor='black',
-                    markeredgewidth=0.8
-                )
-                self.order_markers[order.order_id]['pickup'] = pickup_marker
-                
-                # Pickup point number text
-                pickup_text = self.ax.text(
-                    order.pickup_position[0], 
-                    order.pickup_position[1] + 40,  # Increased offset from 25 to 40
-                    f"#{order.order_id[-3:]}",  # Show last 3 digits of order ID
-                    fontsize=7,  # Increased from 5 to 7
-                    ha='center',
-                    va='bottom',
-                    color='darkblue',
-                    weight='bold'
-                )
-                self.order_markers[order.order_id]['pickup_text'] = pickup_text
+                pickup_x, pickup_y = order.pickup_position
+                slot['pickup'].set_data([pickup_x], [pickup_y])
+                slot['pickup_text'].set_position((pickup_x, pickup_y + 40))
+                slot['pickup_text'].set_text(label)
                 
-                # Dropoff point marker (inverted triangle) - increase size for better visibility
-                dropoff_marker, = self.ax.plot(
-                    order.dropoff_position[0],
-                    order.dropoff_position[1],
-                    marker='v',
-                    markersize=7,  # Increased from 4 to 7
-                    color=COLORS['order']['dropoff'],
-                    markeredgecolor='black',
-                    markeredgewidth=0.8
-                )
-                self.order_markers[order.order_id]['dropoff'] = dropoff_marker
+                dropoff_x, dropoff_y = order.dropoff_position
+                slot['dropoff'].set_data([dropoff_x], [dropoff_y])
+                slot['dropoff_text'].set_position((dropoff_x, dropoff_y - 40))
+                slot['dropoff_text'].set_text(label)
                 
-                # Dropoff point number text
-                dropoff_text = self.ax.text(
-                    order.dropoff_position[0], 
-                    order.dropoff_position[1] - 40,  # Increased offset from 25 to 40
-                    f"#{order.order_id[-3:]}",  # Show last 3 digits of order ID
-                    fontsize=7,  # Increased from 5 to 7
-                    ha='center',
-                    va='top',
-                    color='darkmagenta',
-                    weight='bold'
-                )
-                self.order_markers[order.order_id]['dropoff_text'] = dropoff_text
+                for artist in slot.values():
+                    artist.set_visible(True)
+                self.order_markers[order.order_id] = slot
+    
+    def _create_order_slot(self) -> Dict:
+        """Create one hidden, reusable set of order marker and label artists"""
+        animated = self._blit_enabled
+        
+        # Pickup point marker (triangle)
+        pickup_marker, = self.ax.plot(
+            [], [],
+            marker='^',
+            markersize=7,  # Increased from 4 to 7
+            color=COLORS['order']['pickup'],
+            markeredgecolor='black',
+            markeredgewidth=0.8,
+            visible=False,
+            animated=animated
+        )
+        
+        # Pickup point number text
+        pickup_text = self.ax.text(
+            0, 0, '',
+            fontsize=7,  # Increased from 5 to 7
+            ha='center',
+            va='bottom',
+            color='darkblue',
+            weight='bold',
+            visible=False,
+            animated=animated
+        )
+        
+        # Dropoff point marker (inverted triangle)
+        dropoff_marker, = self.ax.plot(
+            [], [],
+            marker='v',
+            markersize=7,  # Increased from 4 to 7
+            color=COLORS['order']['dropoff'],
+            markeredgecolor='black',
+            markeredgewidth=0.8,
+            visible=False,
+            animated=animated
+        )
+        
+        # Dropoff point number text
+        dropoff_text = self.ax.text(
+            0, 0, '',
+            fontsize=7,  # Increased from 5 to 7
+            ha='center',
+            va='top',
+            color='darkmagenta',
+            weight='bold',
+            visible=False,
+            animated=animated
+        )
+        
+        slot = {
+            'pickup': pickup_marker,
+            'pickup_text': pickup_text,
+            'dropoff': dropoff_marker,
+            'dropoff_text': dropoff_text
+        }
+        self._order_pool.append(slot)
+        return slot
+    
+    def _acquire_order_slot(self) -> Dict:
+        """Get a free order slot, growing the pool only when it is exhausted"""
+        if self._free_order_slots:
+            return self._free_order_slots.pop()
+        return self._create_order_slot()
+    
+    def _release_order_slot(self, slot: Dict):
+        """Hide an order slot's artists and return it to the pool"""
+        for artist in slot.values():
+            artist.set_visible(False)
+        self._free_order_slots.append(slot)
     
-    def _update_info_text(self):
+    def _update_info_text(self, stats: Optional[Dict] = None):
         """Update information text"""
-        # Get statistics
-        stats = self.engine.get_current_statistics()
+        if stats is None:
+            # Get statistics (cached, recomputed at most every stats_update_interval)
+            now = time.monotonic()
+            if self._last_stats is None or now - self._last_stats_time >= self._stats_update_interval:
+                self._last_stats = self.engine.get_current_statistics()
+                self._last_stats_time = now
+            stats = self._last_stats
         
         # Main information
         info_lines = [
@@ -0,0 +1,257 @@
+"""
+PyQtGraph Visualization Module
+Live view for very large fleets: markers are pushed to pyqtgraph scatter items
+in one call per layer instead of being composited by matplotlib's Agg renderer.
+Selected with visualization.live_backend: pyqtgraph (requires pyqtgraph + a Qt binding).
+"""
+
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pyqtgraph as pg
+from matplotlib.colors import to_rgba
+
+from core.simulation_engine import SimulationEngine
+from config.simulation_config import COLORS, VEHICLE_STATUS_CODES
+from visualization.visualizer import Visualizer
+
+
+def _rgba255(color) -> Tuple[int, int, int, int]:
+    """Convert a matplotlib color spec to 0-255 RGBA"""
+    return tuple(int(round(c * 255)) for c in to_rgba(color))
+
+
+class PyQtGraphVisualizer:
+    """PyQtGraph visualizer class, mirrors the Visualizer live API"""
+    
+    # The final report only depends on the engine, so it is shared verbatim
+    _format_final_report = Visualizer._format_final_report
+    
+    def __init__(self, simulation_engine: SimulationEngine, config: Dict):
+        """
+        Initialize visualizer
+        
+        Args:
+            simulation_engine: Simulation engine
+            config: Configuration parameters
+        """
+        self.engine = simulation_engine
+        self.config = config
+        
+        # Live visualization parameters
+        self.fps = config.get('animation_fps', 30)
+        self._steps_per_frame = max(1, config.get('steps_per_frame', 1))  # Physics steps per redraw
+        self._text_update_every = max(1, config.get('text_update_every', 5))
+        self._step = 0
+        
+        # Statistics aggregation is O(vehicles + orders); reuse it for a short interval
+        self._stats_update_interval = config.get('stats_update_interval', 0.2)  # seconds
+        self._last_stats = None
+        self._last_stats_time = float('-inf')
+        self._last_orders_version = None
+        
+        # Brush lookup tables: status code -> brush (last entry for unknown statuses)
+        self._status_brushes = np.array(
+            [pg.mkBrush(*_rgba255(COLORS['vehicle'].get(status, 'gray'))) for status in VEHICLE_STATUS_CODES]
+            + [pg.mkBrush(*_rgba255('gray'))],
+            dtype=object
+        )
+        self._low_battery_brush = pg.mkBrush(*_rgba255(COLORS['low_battery']))
+        
+        # Window and plot
+        self.app = pg.mkQApp("EV Simulation")
+        self.win = pg.GraphicsLayoutWidget(show=True, title=self.engine.map_manager.location)
+        self.win.resize(1500, 1200)
+        self.win.setBackground('w')
+        self.plot = self.win.addPlot(row=0, col=0, title=self.engine.map_manager.location)
+        self.plot.setAspectLocked(True)
+        self.plot.hideAxis('left')
+        self.plot.hideAxis('bottom')
+        self.info_label = self.win.addLabel(row=1, col=0, justify='left', color='k')
+        
+        self._initialize_graphics()
+    
+    # ============= Initialization Methods =============
+    def _initialize_graphics(self):
+        """Initialize graphics elements"""
+        # Road network - every edge in one curve item
+        xs, ys, connect = self._road_network_segments()
+        self.plot.addItem(pg.PlotCurveItem(
+            xs, ys, connect=connect, pen=pg.mkPen(_rgba255('darkgray'), width=1)
+        ))
+        
+        # Charging stations
+        stations = self.engine.get_charging_stations()
+        station_positions = np.array([station.position for station in stations], dtype=float).reshape(-1, 2)
+        self.station_scatter = pg.ScatterPlotItem(
+            pos=station_positions,
+            symbol='s',
+            size=10,
+            brush=pg.mkBrush(*_rgba255(COLORS['charging_station'])),
+            pen=pg.mkPen('k', width=1.2)
+        )
+        self.plot.addItem(self.station_scatter)
+        
+        # Orders: pickup (triangle up) and dropoff (triangle down) layers
+        self.pickup_scatter = pg.ScatterPlotItem(
+            symbol='t1', size=9,
+            brush=pg.mkBrush(*_rgba255(COLORS['order']['pickup'])),
+            pen=pg.mkPen('k', width=0.8)
+        )
+        self.dropoff_scatter = pg.ScatterPlotItem(
+            symbol='t', size=9,
+            brush=pg.mkBrush(*_rgba255(COLORS['order']['dropoff'])),
+            pen=pg.mkPen('k', width=0.8)
+        )
+        self.plot.addItem(self.pickup_scatter)
+        self.plot.addItem(self.dropoff_scatter)
+        
+        # Vehicles - all markers in one scatter item, drawn on top
+        self.vehicle_scatter = pg.ScatterPlotItem(symbol='o', size=7, pen=pg.mkPen('k', width=0.8))
+        self.vehicle_scatter.setZValue(3)
+        self.plot.addItem(self.vehicle_scatter)
+    
+    def _road_network_segments(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Flatten the projected road network into x/y arrays with a connect mask"""
+        graph = self.engine.map_manager.projected_graph
+        xs: List[float] = []
+        ys: List[float] = []
+        connect: List[bool] = []
+        for u, v, data in graph.edges(data=True):
+            if 'geometry' in data:
+                edge_xs, edge_ys = data['geometry'].xy
+            else:
+                edge_xs = (graph.nodes[u]['x'], graph.nodes[v]['x'])
+                edge_ys = (graph.nodes[u]['y'], graph.nodes[v]['y'])
+            xs.extend(edge_xs)
+            ys.extend(edge_ys)
+            # Connect points within an edge, break the line between edges
+            connect.extend([True] * (len(edge_xs) - 1) + [False])
+        return np.asarray(xs, dtype=float), np.asarray(ys, dtype=float), np.asarray(connect, dtype=bool)
+    
+    # ============= Real-time Simulation Methods =============
+    def run_live_simulation(self, duration: float = None):
+        """
+        Run simulation in real-time with live display, no frame storage
+        
+        Args:
+            duration: Simulation duration in seconds, uses config default if None
+        """
+        if duration is None:
+            duration = self.config.get('simulation_duration', 3600)
+        
+        print(f"\n🚀 Starting Live Simulation Visualization (pyqtgraph, Duration: {duration}s)")
+        print("💡 Close window or press Ctrl+C to stop simulation")
+        print("=" * 50)
+        
+        step_count = 0
+        next_progress_step = 100
+        frame_interval = 1.0 / self.fps * 0.2  # Same pace as the matplotlib view
+        next_frame = time.monotonic()
+        
+        try:
+            while self.engine.current_time < duration:
+                # Run a batch of simulation steps per displayed frame
+                for _ in range(self._steps_per_frame):
+                    if self.engine.current_time >= duration:
+                        break
+                    self.engine.run_step()
+                    step_count += 1
+                
+                self._update_live_display()
+                self.app.processEvents()
+                
+                # Check if window was closed
+                if not self.win.isVisible():
+                    print("\n🛑 Window closed, stopping simulation")
+                    break
+                
+                next_frame += frame_interval
+                sleep_for = next_frame - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    next_frame = time.monotonic()
+                
+                # Periodic progress output
+                if step_count >= next_progress_step:
+                    next_progress_step += 100
+                    progress = (self.engine.current_time / duration) * 100
+                    print(f"Simulation progress: {progress:.1f}% (Time: {self.engine.current_time:.1f}s)")
+        
+        except KeyboardInterrupt:
+            print("\n🛑 User interrupted simulation")
+        
+        except Exception as e:
+            print(f"\n❌ Error during simulation: {e}")
+        
+        finally:
+            # Display final statistics (built once, written in a single call)
+            final_stats = self.engine.get_final_statistics()
+            sys.stdout.write(self._format_final_report(final_stats))
+            
+            # Keep window open for user to view final results
+            if self.win.isVisible():
+                print("\n💡 Close window to exit")
+                pg.exec()
+            
+            # Return final_stats for unified saving in main.py
+            return final_stats
+    
+    def _update_live_display(self):
+        """Update live display"""
+        update_text = self._step % self._text_update_every == 0
+        self._step += 1
+        
+        self._update_vehicles()
+        self._update_orders()
+        if update_text:
+            self._update_info_text()
+    
+    # ============= Display Update Methods =============
+    def _update_vehicles(self):
+        """Update vehicle display - one setData call for the whole fleet"""
+        positions, status_codes, batteries = self.engine.vehicle_state_arrays()
+        
+        brushes = self._status_brushes[status_codes]
+        brushes[batteries < 20] = self._low_battery_brush
+        self.vehicle_scatter.setData(pos=positions, brush=brushes)
+    
+    def _update_orders(self):
+        """Update order display"""
+        # Nothing to do until an order is created, completed or cancelled
+        orders_version = self.engine.orders_version()
+        if orders_version == self._last_orders_version:
+            return
+        self._last_orders_version = orders_version
+        
+        orders_info = self.engine.get_orders()
+        active_orders = orders_info['pending'] + orders_info['active']
+        pickups = np.array([order.pickup_position for order in active_orders], dtype=float).reshape(-1, 2)
+        dropoffs = np.array([order.dropoff_position for order in active_orders], dtype=float).reshape(-1, 2)
+        self.pickup_scatter.setData(pos=pickups)
+        self.dropoff_scatter.setData(pos=dropoffs)
+    
+    def _update_info_text(self):
+        """Update information text"""
+        # Get statistics (cached, recomputed at most every stats_update_interval)
+        now = time.monotonic()
+        if self._last_stats is None or now - self._last_stats_time >= self._stats_update_interval:
+            self._last_stats = self.engine.get_current_statistics()
+            self._last_stats_time = now
+        stats = self._last_stats
+        
+        info_lines = [
+            f"Simulation time: {stats['simulation_time']:.1f} seconds",
+            f"Vehicles: {stats['vehicles']['total_vehicles']} vehicles",
+            f"Orders: {stats['orders']['pending_orders']} pending, "
+            f"{stats['orders']['active_orders']} active",
+            f"Average battery: {stats['vehicles']['avg_battery_percentage']:.1f}%",
+            f"Completed orders: {stats['orders']['total_orders_completed']}",
+            f"Total revenue: ${stats['orders']['total_revenue']:.2f}",
+            f"Vehicle utilization rate: {stats['vehicles']['utilization_rate']*100:.1f}%",
+            f"Charging station utilization rate: {stats['charging']['avg_utilization_rate']*100:.1f}%"
+        ]
+        self.info_label.setText('<br>'.join(info_lines))
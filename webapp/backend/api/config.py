@@ -3,8 +3,11 @@ Configuration Management API Endpoints
 支持YAML配置文件的管理，实现前后端统一配置
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any, Optional
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from fastapi import APIRouter, Query
+from typing import List, Dict, Any, Optional, Tuple
 from webapp.backend.models.response import APIResponse
 from config.yaml_config_manager import config_manager, SimulationConfigModel
 from config.simulation_config import convert_dict_to_yaml
@@ -13,6 +16,127 @@ import json
 
 router = APIRouter()
 
+# 业务规则警告: (检查函数, 警告信息)，在验证通过的配置上逐条检查
+_WARNING_RULES = [
+    (lambda c: c.vehicles.count > 100, "车辆数量过多，可能影响性能"),
+    (lambda c: c.simulation.duration > 7200, "仿真时长较长，建议使用较小的时间步长"),  # 2小时
+    (lambda c: c.orders.generation_rate > 5000, "订单生成率过高，可能导致系统过载"),
+]
+
+# 已解析的配置/模板缓存: 文件名 -> (文件mtime, 配置模型)，文件被修改后自动失效
+_config_cache: Dict[str, Tuple[int, SimulationConfigModel]] = {}
+_template_cache: Dict[str, Tuple[int, SimulationConfigModel]] = {}
+
+
+def _build_config_model(config_data: Dict[str, Any]) -> SimulationConfigModel:
+    """将请求中的配置数据转换并验证为配置模型
+    
+    Raises:
+        ValidationError: 配置验证失败
+    """
+    if 'simulation' in config_data:
+        # 已经是新格式，model_validate直接复用模型已构建的校验器，不做kwargs展开
+        return SimulationConfigModel.model_validate(config_data)
+    # 传统格式，需要转换
+    return convert_dict_to_yaml(config_data)
+
+
+def _normalize_config_name(config_name: str) -> str:
+    """确保配置文件名带有.yaml扩展名"""
+    return config_name if config_name.endswith('.yaml') else config_name + '.yaml'
+
+
+def _config_exists(config_name: str) -> bool:
+    """检查配置文件是否存在（单次stat，无需扫描目录）"""
+    return (config_manager.config_dir / config_name).is_file()
+
+
+def _load_config_cached(config_name: str) -> SimulationConfigModel:
+    """加载配置文件，文件未修改时直接复用上次解析验证的结果
+    
+    Raises:
+        FileNotFoundError: 配置文件不存在
+    """
+    mtime = (config_manager.config_dir / config_name).stat().st_mtime_ns
+    cached = _config_cache.get(config_name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    config = config_manager.load_config(config_name)
+    _config_cache[config_name] = (mtime, config)
+    return config
+
+
+def _cache_saved_config(config_name: str, config_model: SimulationConfigModel):
+    """写穿缓存：保存成功后直接缓存已验证的模型，下次读取无需重新解析和验证"""
+    config_path = config_manager.config_dir / config_name
+    # 与load_config一致地附带元数据
+    cached_model = config_model.model_copy(update={'metadata': {
+        'config_file': config_name,
+        'loaded_at': datetime.now().isoformat(),
+        'file_path': str(config_path)
+    }})
+    cached_model.__dict__.pop('dict_cached', None)  # model_copy也会复制已缓存的序列化结果
+    _config_cache[config_name] = (config_path.stat().st_mtime_ns, cached_model)
+
+
+def _load_template_cached(template_name: str) -> SimulationConfigModel:
+    """加载配置模板，文件未修改时直接复用上次解析验证的结果
+    
+    Raises:
+        FileNotFoundError: 模板不存在
+    """
+    mtime = (config_manager.templates_dir / f"{template_name}.yaml").stat().st_mtime_ns
+    cached = _template_cache.get(template_name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    template = config_manager.load_template(template_name)
+    _template_cache[template_name] = (mtime, template)
+    return template
+
+
+def _load_config_info(config_file: str) -> Dict[str, Any]:
+    """加载单个配置文件的基本信息（在线程池中执行）
+    
+    列表只需要几个字段，因此只解析YAML，不做完整的模型验证
+    """
+    try:
+        summary = config_manager.summarize(config_file)
+        return {
+            "filename": config_file,
+            **summary,
+            "created_at": datetime.now().isoformat()
+        }
+    except Exception as e:
+        # 如果某个配置文件损坏，记录错误但继续处理其他文件
+        return {
+            "filename": config_file,
+            "name": "配置文件损坏",
+            "error": str(e)
+        }
+
+
+def _load_template_info(template_file: str) -> Dict[str, Any]:
+    """加载单个模板的基本信息（在线程池中执行）"""
+    template_name = Path(template_file).stem
+    try:
+        template = _load_template_cached(template_name)
+        return {
+            "name": template_name,
+            "filename": template_file,
+            "simulation_name": template.simulation.name,
+            "location": template.simulation.location,
+            "vehicles": template.vehicles.count,
+            "duration": template.simulation.duration
+        }
+    except Exception as e:
+        return {
+            "name": template_name,
+            "filename": template_file,
+            "error": str(e)
+        }
+
 
 class ConfigCreateRequest(BaseModel):
     """创建配置请求"""
@@ -33,91 +157,61 @@ class ConfigValidationRequest(BaseModel):
 @router.get("/list", response_model=APIResponse)
 async def list_configurations():
     """列出所有可用的配置文件"""
-    try:
-        config_files = config_manager.list_configs()
-        
-        # 获取每个配置文件的基本信息
-        configs_info = []
-        for config_file in config_files:
-            try:
-                config = config_manager.load_config(config_file)
-                info = {
-                    "filename": config_file,
-                    "name": config.simulation.name,
-                    "location": config.simulation.location,
-                    "vehicles": config.vehicles.count,
-                    "duration": config.simulation.duration,
-                    "created_at": config.metadata.get('loaded_at', 'Unknown')
-                }
-                configs_info.append(info)
-            except Exception as e:
-                # 如果某个配置文件损坏，记录错误但继续处理其他文件
-                configs_info.append({
-                    "filename": config_file,
-                    "name": "配置文件损坏",
-                    "error": str(e)
-                })
-        
-        return APIResponse(
-            success=True,
-            message=f"找到 {len(configs_info)} 个配置文件",
-            data={"configurations": configs_info}
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"获取配置列表失败: {str(e)}")
+    config_files = config_manager.list_configs()
+    
+    # 并行读取每个配置文件的基本信息，阻塞I/O不占用事件循环
+    configs_info = await asyncio.gather(
+        *(asyncio.to_thread(_load_config_info, config_file) for config_file in config_files)
+    )
+    
+    return APIResponse(
+        success=True,
+        message=f"找到 {len(configs_info)} 个配置文件",
+        data={"configurations": configs_info}
+    )
 
 
 @router.post("/create", response_model=APIResponse)
 async def create_configuration(request: ConfigCreateRequest):
     """创建新的配置文件"""
+    # 验证配置文件名
+    request.name = _normalize_config_name(request.name)
+    
+    # 检查文件是否已存在
+    if _config_exists(request.name):
+        return APIResponse(
+            success=False,
+            message="配置文件已存在",
+            error=f"配置文件 {request.name} 已经存在"
+        )
+    
+    # 转换配置数据为YAML模型
     try:
-        # 验证配置文件名
-        if not request.name.endswith('.yaml'):
-            request.name += '.yaml'
-        
-        # 检查文件是否已存在
-        existing_configs = config_manager.list_configs()
-        if request.name in existing_configs:
-            return APIResponse(
-                success=False,
-                message="配置文件已存在",
-                error=f"配置文件 {request.name} 已经存在"
-            )
-        
-        # 转换配置数据为YAML模型
-        try:
-            if 'simulation' in request.config_data:
-                # 已经是新格式
-                config_model = SimulationConfigModel(**request.config_data)
-            else:
-                # 传统格式，需要转换
-                config_model = convert_dict_to_yaml(request.config_data)
-        except ValidationError as e:
-            return APIResponse(
-                success=False,
-                message="配置数据验证失败",
-                error=f"配置验证错误: {str(e)}"
-            )
-        
-        # 保存配置文件
-        success = config_manager.save_config(config_model, request.name)
-        
-        if success:
-            return APIResponse(
-                success=True,
-                message=f"配置文件 {request.name} 创建成功",
-                data={"filename": request.name, "config": config_model.dict()}
-            )
-        else:
-            return APIResponse(
-                success=False,
-                message="保存配置文件失败",
-                error="无法写入配置文件"
-            )
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"创建配置失败: {str(e)}")
+        config_model = _build_config_model(request.config_data)
+    except ValidationError as e:
+        return APIResponse(
+            success=False,
+            message="配置数据验证失败",
+            error=f"配置验证错误: {str(e)}"
+        )
+    
+    # 保存配置文件
+    success = config_manager.save_config(config_model, request.name)
+    if success:
+        _cache_saved_config(request.name, config_model)
+    
+    if success:
+        return APIResponse(
+            success=True,
+            message=f"配置文件 {request.name} 创建成功",
+            data={"filename": request.name, "config": config_model.model_dump()}
+        )
+    else:
+        return APIResponse(
+            success=False,
+            message="保存配置文件失败",
+            error="无法写入配置文件"
+        )
 
 
 @router.get("/{config_name}", response_model=APIResponse)
@@ -125,17 +219,16 @@ async def get_configuration(config_name: str):
     """获取指定的配置文件"""
     try:
         # 确保文件名有正确的扩展名
-        if not config_name.endswith('.yaml'):
-            config_name += '.yaml'
+        config_name = _normalize_config_name(config_name)
         
-        config = config_manager.load_config(config_name)
+        config = _load_config_cached(config_name)
         
         return APIResponse(
             success=True,
             message=f"配置 {config_name} 加载成功",
             data={
                 "filename": config_name,
-                "config": config.dict(),
+                "config": config.dict_cached,
                 "yaml_format": True
             }
         )
@@ -152,245 +245,186 @@ async def get_configuration(config_name: str):
             message="配置文件格式错误",
             error=f"配置验证失败: {str(e)}"
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"获取配置失败: {str(e)}")
 
 
 @router.put("/{config_name}", response_model=APIResponse)
 async def update_configuration(config_name: str, request: ConfigUpdateRequest):
     """更新指定的配置文件"""
+    # 确保文件名有正确的扩展名
+    config_name = _normalize_config_name(config_name)
+    
+    # 检查配置文件是否存在
+    if not _config_exists(config_name):
+        return APIResponse(
+            success=False,
+            message="配置文件不存在",
+            error=f"找不到配置文件: {config_name}"
+        )
+    
+    # 转换和验证配置数据
     try:
-        # 确保文件名有正确的扩展名
-        if not config_name.endswith('.yaml'):
-            config_name += '.yaml'
-        
-        # 检查配置文件是否存在
-        existing_configs = config_manager.list_configs()
-        if config_name not in existing_configs:
-            return APIResponse(
-                success=False,
-                message="配置文件不存在",
-                error=f"找不到配置文件: {config_name}"
-            )
-        
-        # 转换和验证配置数据
-        try:
-            if 'simulation' in request.config_data:
-                # 已经是新格式
-                config_model = SimulationConfigModel(**request.config_data)
-            else:
-                # 传统格式，需要转换
-                config_model = convert_dict_to_yaml(request.config_data)
-        except ValidationError as e:
-            return APIResponse(
-                success=False,
-                message="配置数据验证失败",
-                error=f"配置验证错误: {str(e)}"
-            )
-        
-        # 保存更新的配置
-        success = config_manager.save_config(config_model, config_name)
-        
-        if success:
-            return APIResponse(
-                success=True,
-                message=f"配置文件 {config_name} 更新成功",
-                data={"filename": config_name, "config": config_model.dict()}
-            )
-        else:
-            return APIResponse(
-                success=False,
-                message="保存配置文件失败",
-                error="无法写入配置文件"
-            )
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"更新配置失败: {str(e)}")
+        config_model = _build_config_model(request.config_data)
+    except ValidationError as e:
+        return APIResponse(
+            success=False,
+            message="配置数据验证失败",
+            error=f"配置验证错误: {str(e)}"
+        )
+    
+    # 保存更新的配置
+    success = config_manager.save_config(config_model, config_name)
+    if success:
+        _cache_saved_config(config_name, config_model)
+    else:
+        _config_cache.pop(config_name, None)
+    
+    if success:
+        return APIResponse(
+            success=True,
+            message=f"配置文件 {config_name} 更新成功",
+            data={"filename": config_name, "config": config_model.model_dump()}
+        )
+    else:
+        return APIResponse(
+            success=False,
+            message="保存配置文件失败",
+            error="无法写入配置文件"
+        )
 
 
 @router.delete("/{config_name}", response_model=APIResponse)
 async def delete_configuration(config_name: str):
     """删除指定的配置文件"""
+    # 确保文件名有正确的扩展名
+    config_name = _normalize_config_name(config_name)
+    
+    # 不允许删除默认配置
+    if config_name == "default.yaml":
+        return APIResponse(
+            success=False,
+            message="不能删除默认配置",
+            error="default.yaml 是系统默认配置，不能删除"
+        )
+    
+    # 删除文件及摘要索引（直接unlink，不存在时由异常判断，避免额外的exists检查）
     try:
-        # 确保文件名有正确的扩展名
-        if not config_name.endswith('.yaml'):
-            config_name += '.yaml'
-        
-        # 不允许删除默认配置
-        if config_name == "default.yaml":
-            return APIResponse(
-                success=False,
-                message="不能删除默认配置",
-                error="default.yaml 是系统默认配置，不能删除"
-            )
-        
-        config_path = config_manager.config_dir / config_name
-        
-        if not config_path.exists():
-            return APIResponse(
-                success=False,
-                message="配置文件不存在",
-                error=f"找不到配置文件: {config_name}"
-            )
-        
-        # 删除文件
-        config_path.unlink()
-        
+        await asyncio.to_thread(config_manager.delete_config, config_name)
+    except FileNotFoundError:
         return APIResponse(
-            success=True,
-            message=f"配置文件 {config_name} 删除成功",
-            data={"deleted_file": config_name}
+            success=False,
+            message="配置文件不存在",
+            error=f"找不到配置文件: {config_name}"
         )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"删除配置失败: {str(e)}")
+    finally:
+        _config_cache.pop(config_name, None)
+    
+    return APIResponse(
+        success=True,
+        message=f"配置文件 {config_name} 删除成功",
+        data={"deleted_file": config_name}
+    )
 
 
 @router.post("/validate", response_model=APIResponse)
 async def validate_configuration(request: ConfigValidationRequest):
     """验证配置数据的正确性"""
+    # 尝试转换和验证配置数据
     try:
-        # 尝试转换和验证配置数据
-        try:
-            if 'simulation' in request.config_data:
-                # 已经是新格式
-                config_model = SimulationConfigModel(**request.config_data)
-            else:
-                # 传统格式，需要转换
-                config_model = convert_dict_to_yaml(request.config_data)
-            
-            # 额外的业务逻辑验证
-            validation_warnings = []
-            
-            # 检查参数合理性
-            if config_model.vehicles.count > 100:
-                validation_warnings.append("车辆数量过多，可能影响性能")
-            
-            if config_model.simulation.duration > 7200:  # 2小时
-                validation_warnings.append("仿真时长较长，建议使用较小的时间步长")
-            
-            if config_model.orders.generation_rate > 5000:
-                validation_warnings.append("订单生成率过高，可能导致系统过载")
-            
-            return APIResponse(
-                success=True,
-                message="配置验证通过",
-                data={
-                    "valid": True,
-                    "config": config_model.dict(),
-                    "warnings": validation_warnings
-                }
-            )
-            
-        except ValidationError as e:
-            validation_errors = []
-            for error in e.errors():
-                field_path = " -> ".join(str(x) for x in error["loc"])
-                validation_errors.append({
-                    "field": field_path,
-                    "message": error["msg"],
-                    "type": error["type"]
-                })
-            
-            return APIResponse(
-                success=False,
-                message="配置验证失败",
-                data={
-                    "valid": False,
-                    "errors": validation_errors
-                }
-            )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"配置验证失败: {str(e)}")
-
-
-@router.get("/templates/list", response_model=APIResponse)
-async def list_templates():
-    """列出所有配置模板"""
-    try:
-        template_files = list(config_manager.templates_dir.glob("*.yaml"))
-        templates_info = []
+        config_model = _build_config_model(request.config_data)
         
-        for template_file in template_files:
-            template_name = template_file.stem
-            try:
-                template = config_manager.load_template(template_name)
-                info = {
-                    "name": template_name,
-                    "filename": template_file.name,
-                    "simulation_name": template.simulation.name,
-                    "location": template.simulation.location,
-                    "vehicles": template.vehicles.count,
-                    "duration": template.simulation.duration
-                }
-                templates_info.append(info)
-            except Exception as e:
-                templates_info.append({
-                    "name": template_name,
-                    "filename": template_file.name,
-                    "error": str(e)
-                })
+        # 额外的业务逻辑验证：检查参数合理性
+        validation_warnings = [message for check, message in _WARNING_RULES if check(config_model)]
         
         return APIResponse(
             success=True,
-            message=f"找到 {len(templates_info)} 个模板",
-            data={"templates": templates_info}
+            message="配置验证通过",
+            data={
+                "valid": True,
+                "config": config_model.model_dump(),
+                "warnings": validation_warnings
+            }
         )
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"获取模板列表失败: {str(e)}")
+    except ValidationError as e:
+        validation_errors = []
+        for error in e.errors():
+            field_path = " -> ".join(str(x) for x in error["loc"])
+            validation_errors.append({
+                "field": field_path,
+                "message": error["msg"],
+                "type": error["type"]
+            })
+        
+        return APIResponse(
+            success=False,
+            message="配置验证失败",
+            data={
+                "valid": False,
+                "errors": validation_errors
+            }
+        )
+
+
+@router.get("/templates/list", response_model=APIResponse)
+async def list_templates():
+    """列出所有配置模板"""
+    template_files = config_manager.list_templates()
+    
+    # 并行读取每个模板的基本信息
+    templates_info = await asyncio.gather(
+        *(asyncio.to_thread(_load_template_info, template_file) for template_file in template_files)
+    )
+    
+    return APIResponse(
+        success=True,
+        message=f"找到 {len(templates_info)} 个模板",
+        data={"templates": templates_info}
+    )
 
 
 @router.post("/templates/{template_name}", response_model=APIResponse)
 async def create_template(template_name: str, request: ConfigValidationRequest):
     """创建配置模板"""
+    # 转换和验证配置数据
     try:
-        # 转换和验证配置数据
-        try:
-            if 'simulation' in request.config_data:
-                config_model = SimulationConfigModel(**request.config_data)
-            else:
-                config_model = convert_dict_to_yaml(request.config_data)
-        except ValidationError as e:
-            return APIResponse(
-                success=False,
-                message="配置数据验证失败",
-                error=f"配置验证错误: {str(e)}"
-            )
-        
-        # 创建模板
-        success = config_manager.create_template(template_name, config_model)
-        
-        if success:
-            return APIResponse(
-                success=True,
-                message=f"模板 {template_name} 创建成功",
-                data={"template_name": template_name}
-            )
-        else:
-            return APIResponse(
-                success=False,
-                message="创建模板失败",
-                error="无法保存模板文件"
-            )
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"创建模板失败: {str(e)}")
+        config_model = _build_config_model(request.config_data)
+    except ValidationError as e:
+        return APIResponse(
+            success=False,
+            message="配置数据验证失败",
+            error=f"配置验证错误: {str(e)}"
+        )
+    
+    # 创建模板
+    success = config_manager.create_template(template_name, config_model)
+    _template_cache.pop(template_name, None)
+    
+    if success:
+        return APIResponse(
+            success=True,
+            message=f"模板 {template_name} 创建成功",
+            data={"template_name": template_name}
+        )
+    else:
+        return APIResponse(
+            success=False,
+            message="创建模板失败",
+            error="无法保存模板文件"
+        )
 
 
 @router.get("/templates/{template_name}", response_model=APIResponse)
 async def get_template(template_name: str):
     """获取指定的配置模板"""
     try:
-        template = config_manager.load_template(template_name)
+        template = _load_template_cached(template_name)
         
         return APIResponse(
             success=True,
             message=f"模板 {template_name} 加载成功",
             data={
                 "template_name": template_name,
-                "config": template.dict()
+                "config": template.dict_cached
             }
         )
         
@@ -399,6 +433,4 @@ async def get_template(template_name: str):
             success=False,
             message="模板不存在",
             error=f"找不到模板: {template_name}"
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"获取模板失败: {str(e)}") 
\ No newline at end of file
+        )
\ No newline at end of file
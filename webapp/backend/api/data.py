@@ -2,160 +2,166 @@
 Data Query API Endpoints
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+import uuid
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, Optional
 from webapp.backend.models.response import APIResponse
 from webapp.backend.services.simulation_service import simulation_service
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 router = APIRouter()
 
+# ETag prefix unique to this process, so tags from a previous run never match
+_ETAG_PREFIX = uuid.uuid4().hex[:8]
+
+
+def _data_response(message: str, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Encode a successful APIResponse envelope straight to JSON bytes
+    
+    Returning a Response skips FastAPI's response_model pass, which would
+    otherwise re-validate and re-walk the large already-serialized lists.
+    """
+    payload = {"success": True, "message": message, "data": data, "error": None}
+    if orjson is None:
+        return JSONResponse(content=payload, headers=headers)
+    return Response(content=orjson.dumps(payload), media_type="application/json", headers=headers)
+
 
 @router.get("/vehicles", response_model=APIResponse)
-async def get_vehicles(vehicle_id: Optional[str] = Query(None)):
-    """Get vehicles data"""
-    try:
-        current_state = simulation_service.get_current_state()
-        
-        if not current_state:
+async def get_vehicles(request: Request, vehicle_id: Optional[str] = Query(None)):
+    """Get vehicles data (full list supports If-None-Match / 304)"""
+    current_state = simulation_service.get_current_state()
+    
+    if not current_state:
+        return APIResponse(
+            success=False,
+            message="No simulation data available",
+            error="Simulation not running"
+        )
+    
+    if vehicle_id:
+        # Filter specific vehicle
+        vehicle = current_state.vehicles_by_id.get(vehicle_id)
+        if not vehicle:
             return APIResponse(
                 success=False,
-                message="No simulation data available",
-                error="Simulation not running"
+                message=f"Vehicle {vehicle_id} not found",
+                error="Vehicle not found"
             )
-        
-        vehicles = current_state.vehicles
-        
-        if vehicle_id:
-            # Filter specific vehicle
-            vehicle = next((v for v in vehicles if v.vehicle_id == vehicle_id), None)
-            if not vehicle:
-                return APIResponse(
-                    success=False,
-                    message=f"Vehicle {vehicle_id} not found",
-                    error="Vehicle not found"
-                )
-            vehicles = [vehicle]
-        
-        return APIResponse(
-            success=True,
-            message=f"Retrieved {len(vehicles)} vehicle(s)",
-            data={"vehicles": [v.dict() for v in vehicles]}
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        vehicle_dicts = [vehicle.as_dict]
+        headers = None
+    else:
+        # Vehicle list unchanged since the client's last poll: nothing to resend
+        etag = f'"{_ETAG_PREFIX}-{current_state.vehicles_version}"'
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        headers = {"ETag": etag}
+        vehicle_dicts = current_state.vehicle_dicts
+    
+    return _data_response(
+        f"Retrieved {len(vehicle_dicts)} vehicle(s)",
+        {"vehicles": vehicle_dicts},
+        headers
+    )
 
 
 @router.get("/charging-stations", response_model=APIResponse)
 async def get_charging_stations(station_id: Optional[str] = Query(None)):
     """Get charging stations data"""
-    try:
-        current_state = simulation_service.get_current_state()
-        
-        if not current_state:
+    current_state = simulation_service.get_current_state()
+    
+    if not current_state:
+        return APIResponse(
+            success=False,
+            message="No simulation data available",
+            error="Simulation not running"
+        )
+    
+    if station_id:
+        # Filter specific station
+        station = current_state.charging_stations_by_id.get(station_id)
+        if not station:
             return APIResponse(
                 success=False,
-                message="No simulation data available",
-                error="Simulation not running"
+                message=f"Charging station {station_id} not found",
+                error="Station not found"
             )
-        
-        stations = current_state.charging_stations
-        
-        if station_id:
-            # Filter specific station
-            station = next((s for s in stations if s.station_id == station_id), None)
-            if not station:
-                return APIResponse(
-                    success=False,
-                    message=f"Charging station {station_id} not found",
-                    error="Station not found"
-                )
-            stations = [station]
-        
-        return APIResponse(
-            success=True,
-            message=f"Retrieved {len(stations)} charging station(s)",
-            data={"charging_stations": [s.dict() for s in stations]}
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        station_dicts = [station.model_dump()]
+    else:
+        station_dicts = current_state.charging_station_dicts
+    
+    return _data_response(
+        f"Retrieved {len(station_dicts)} charging station(s)",
+        {"charging_stations": station_dicts}
+    )
 
 
 @router.get("/orders", response_model=APIResponse)
 async def get_orders(status: Optional[str] = Query(None), limit: int = Query(100)):
     """Get orders data"""
-    try:
-        current_state = simulation_service.get_current_state()
-        
-        if not current_state:
-            return APIResponse(
-                success=False,
-                message="No simulation data available",
-                error="Simulation not running"
-            )
-        
-        orders = current_state.orders
-        
-        if status:
-            # Filter by status
-            orders = [o for o in orders if o.status.lower() == status.lower()]
-        
-        # Apply limit
-        orders = orders[:limit]
-        
+    current_state = simulation_service.get_current_state()
+    
+    if not current_state:
         return APIResponse(
-            success=True,
-            message=f"Retrieved {len(orders)} order(s)",
-            data={"orders": [o.dict() for o in orders]}
+            success=False,
+            message="No simulation data available",
+            error="Simulation not running"
         )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    if status:
+        # Filter by status
+        orders = current_state.orders_by_status.get(status.lower(), [])
+        order_dicts = [o.model_dump() for o in orders[:limit]]
+    else:
+        # Apply limit
+        order_dicts = current_state.order_dicts[:limit]
+    
+    return _data_response(
+        f"Retrieved {len(order_dicts)} order(s)",
+        {"orders": order_dicts}
+    )
 
 
 @router.get("/statistics", response_model=APIResponse)
 async def get_statistics():
     """Get simulation statistics"""
-    try:
-        current_state = simulation_service.get_current_state()
-        
-        if not current_state:
-            return APIResponse(
-                success=False,
-                message="No simulation data available",
-                error="Simulation not running"
-            )
-        
+    current_state = simulation_service.get_current_state()
+    
+    if not current_state:
         return APIResponse(
-            success=True,
-            message="Statistics retrieved successfully",
-            data={"statistics": current_state.stats.dict()}
+            success=False,
+            message="No simulation data available",
+            error="Simulation not running"
         )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    return APIResponse(
+        success=True,
+        message="Statistics retrieved successfully",
+        data={"statistics": current_state.stats.model_dump()}
+    )
 
 
 @router.get("/map-bounds", response_model=APIResponse)
 async def get_map_bounds():
     """Get map bounds for the current simulation location"""
-    try:
-        # This would require extending the simulation service to provide map bounds
-        # For now, return default bounds for West Lafayette
-        bounds = {
-            "north": 40.4500,
-            "south": 40.4000,
-            "east": -86.8500,
-            "west": -86.9500,
-            "center": [40.4259, -86.9081]  # [lat, lon]
-        }
-        
-        return APIResponse(
-            success=True,
-            message="Map bounds retrieved successfully",
-            data={"bounds": bounds}
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+    # This would require extending the simulation service to provide map bounds
+    # For now, return default bounds for West Lafayette
+    bounds = {
+        "north": 40.4500,
+        "south": 40.4000,
+        "east": -86.8500,
+        "west": -86.9500,
+        "center": [40.4259, -86.9081]  # [lat, lon]
+    }
+    
+    return APIResponse(
+        success=True,
+        message="Map bounds retrieved successfully",
+        data={"bounds": bounds}
+    )
\ No newline at end of file
@@ -3,27 +3,102 @@ EV Simulation Web Backend
 FastAPI application entry point
 """
 
+import importlib
+import logging
+import queue
 import sys
 import os
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
+from typing import Dict
+
+# orjson encodes the large state/list payloads several times faster than stdlib json
+try:
+    import orjson  # noqa: F401
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
 
 # Add parent directories to path to import from existing simulation system
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from webapp.backend.api import simulation, data, config
-from webapp.backend.websocket import simulation_ws
+from webapp.backend.models.response import APIResponse
+
+# Backend log records are written to stdout by a background thread, so a burst of
+# WebSocket connects/disconnects never blocks the event loop on console I/O
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_handler)
+_backend_logger = logging.getLogger("webapp.backend")
+_backend_logger.addHandler(QueueHandler(_log_queue))
+_backend_logger.setLevel(logging.INFO)
+_backend_logger.propagate = False
+
+# Routers: (module, URL prefix, OpenAPI tag)
+ROUTERS = [
+    ("webapp.backend.api.simulation", "/api/simulation", "simulation"),
+    ("webapp.backend.api.data", "/api/data", "data"),
+    ("webapp.backend.api.config", "/api/config", "configuration"),  # 新增配置管理API
+    ("webapp.backend.websocket.simulation_ws", "/ws", "websocket"),
+]
+
+
+class UnhandledErrorMiddleware:
+    """Return unexpected endpoint errors in the standard APIResponse envelope
+    
+    Added before CORSMiddleware so it sits inside it: the 500 reply still gets
+    the CORS headers (an app-level Exception handler runs outside CORS).
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            response = JSONResponse(
+                status_code=500,
+                content=APIResponse(
+                    success=False,
+                    message="Internal server error",
+                    error=str(exc)
+                ).model_dump()
+            )
+            await response(scope, receive, send)
+
 
 # Create FastAPI app
 app = FastAPI(
     title="EV Simulation Web API",
     description="Real-time Electric Vehicle Simulation with Interactive Web Interface",
-    version="2.0.0"  # 升级版本号以反映YAML配置支持
+    version="2.0.0",  # 升级版本号以反映YAML配置支持
+    default_response_class=DefaultResponse
 )
 
+# Unexpected errors from any endpoint are reported once here instead of per-route try/except
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Add CORS middleware for development
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +108,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.on_event("startup")
+async def start_log_listener():
+    """Start the background log writer"""
+    _log_listener.start()
+
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    """Flush and stop the background log writer"""
+    _log_listener.stop()
+
+
 # Mount static files (CSS, JS, images)
 frontend_path = Path(__file__).parent.parent / "frontend"
 app.mount("/static", StaticFiles(directory=str(frontend_path / "static")), name="static")
@@ -40,41 +128,51 @@ app.mount("/static", StaticFiles(directory=str(frontend_path / "static")), name=
 # Setup Jinja2 templates
 templates = Jinja2Templates(directory=str(frontend_path / "templates"))
 
+# The pages are static (no per-request context), so each is rendered once
+_PAGE_CACHE: Dict[str, bytes] = {}
+
+
+def render_page(template_name: str) -> HTMLResponse:
+    """Serve a page template, rendering it on first use only"""
+    content = _PAGE_CACHE.get(template_name)
+    if content is None:
+        content = templates.get_template(template_name).render({}).encode("utf-8")
+        _PAGE_CACHE[template_name] = content
+    return HTMLResponse(content=content)
+
 # Include API routers
-app.include_router(simulation.router, prefix="/api/simulation", tags=["simulation"])
-app.include_router(data.router, prefix="/api/data", tags=["data"])
-app.include_router(config.router, prefix="/api/config", tags=["configuration"])  # 新增配置管理API
-app.include_router(simulation_ws.router, prefix="/ws", tags=["websocket"])
+for module_name, prefix, tag in ROUTERS:
+    app.include_router(importlib.import_module(module_name).router, prefix=prefix, tags=[tag])
 
-@app.get("/")
-async def root(request: Request):
+@app.get("/", response_class=HTMLResponse)
+async def root():
     """Main application page"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return render_page("index.html")
 
-@app.get("/vehicles")
-async def vehicles_page(request: Request):
+@app.get("/vehicles", response_class=HTMLResponse)
+async def vehicles_page():
     """Vehicle tracking page"""
-    return templates.TemplateResponse("vehicles.html", {"request": request})
+    return render_page("vehicles.html")
 
-@app.get("/orders")
-async def orders_page(request: Request):
+@app.get("/orders", response_class=HTMLResponse)
+async def orders_page():
     """Order tracking page"""
-    return templates.TemplateResponse("orders.html", {"request": request})
+    return render_page("orders.html")
 
-@app.get("/charging-stations")
-async def charging_stations_page(request: Request):
+@app.get("/charging-stations", response_class=HTMLResponse)
+async def charging_stations_page():
     """Charging station tracking page"""
-    return templates.TemplateResponse("charging-stations.html", {"request": request})
+    return render_page("charging-stations.html")
 
-@app.get("/config")
-async def config_page(request: Request):
+@app.get("/config", response_class=HTMLResponse)
+async def config_page():
     """Configuration page"""
-    return templates.TemplateResponse("config.html", {"request": request})
+    return render_page("config.html")
 
-@app.get("/dashboard")
-async def dashboard(request: Request):
+@app.get("/dashboard", response_class=HTMLResponse)
+async def dashboard():
     """Simulation dashboard page"""
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return render_page("dashboard.html")
 
 @app.get("/health")
 async def health_check():
@@ -2,8 +2,9 @@
 Response Models for API Data Transfer
 """
 
+from functools import cached_property
 from typing import List, Dict, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 class VehicleData(BaseModel):
@@ -14,6 +15,11 @@ class VehicleData(BaseModel):
     battery_percentage: float
     current_order_id: Optional[str] = None
     destination: Optional[List[float]] = None
+    
+    @cached_property
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialized form; shared by every state that reuses this unchanged vehicle"""
+        return self.model_dump()
 
 
 class ChargingStationData(BaseModel):
@@ -61,6 +67,65 @@ class SimulationState(BaseModel):
     orders: List[OrderData]
     stats: SimulationStats
     timestamp: float
+    
+    # Set by the service; changes only when some vehicle's data changed (not serialized)
+    _vehicles_version: int = PrivateAttr(default=0)
+    
+    @property
+    def vehicles_version(self) -> int:
+        """Version of the vehicle list, equal across states with identical vehicles"""
+        return self._vehicles_version
+    
+    # A state is built once per simulation tick and never modified, so the
+    # serialized forms below are computed on first use and shared by every poll
+    @cached_property
+    def vehicles_by_id(self) -> Dict[str, VehicleData]:
+        """Vehicles indexed by vehicle_id"""
+        return {v.vehicle_id: v for v in self.vehicles}
+    
+    @cached_property
+    def charging_stations_by_id(self) -> Dict[str, ChargingStationData]:
+        """Charging stations indexed by station_id"""
+        return {s.station_id: s for s in self.charging_stations}
+    
+    @cached_property
+    def orders_by_status(self) -> Dict[str, List[OrderData]]:
+        """Orders grouped by lowercased status, in original order"""
+        grouped: Dict[str, List[OrderData]] = {}
+        for o in self.orders:
+            grouped.setdefault(o.status.lower(), []).append(o)
+        return grouped
+    
+    @cached_property
+    def vehicle_dicts(self) -> List[Dict[str, Any]]:
+        """Vehicles serialized to plain dicts"""
+        return [v.as_dict for v in self.vehicles]
+    
+    @cached_property
+    def charging_station_dicts(self) -> List[Dict[str, Any]]:
+        """Charging stations serialized to plain dicts"""
+        return [s.model_dump() for s in self.charging_stations]
+    
+    @cached_property
+    def order_dicts(self) -> List[Dict[str, Any]]:
+        """Orders serialized to plain dicts"""
+        return [o.model_dump() for o in self.orders]
+    
+    @cached_property
+    def as_dict(self) -> Dict[str, Any]:
+        """Whole state serialized to a plain dict (same shape as model_dump())"""
+        return {
+            "vehicles": self.vehicle_dicts,
+            "charging_stations": self.charging_station_dicts,
+            "orders": self.order_dicts,
+            "stats": self.stats.model_dump(),
+            "timestamp": self.timestamp
+        }
+    
+    @cached_property
+    def as_json(self) -> bytes:
+        """Whole state serialized to JSON bytes (same as model_dump_json())"""
+        return self.model_dump_json().encode("utf-8")
 
 
 class SimulationConfig(BaseModel):
@@ -4,9 +4,12 @@ Wraps existing simulation engine for web application
 """
 
 import asyncio
+import logging
 import threading
 import time
-from typing import Dict, List, Optional, Callable
+import numpy as np
+from operator import attrgetter, itemgetter
+from typing import Dict, Optional, Callable, Tuple
 from datetime import datetime
 
 # Import existing simulation system
@@ -15,9 +18,42 @@ from config.simulation_config import SIMULATION_CONFIG, get_config, load_yaml_co
 from config.yaml_config_manager import config_manager, SimulationConfigModel
 from webapp.backend.models.response import (
     VehicleData, ChargingStationData, OrderData, 
-    SimulationStats, SimulationState, SimulationConfig
+    SimulationStats, SimulationState, SimulationConfig, WebSocketMessage
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# REST state models (and the fallback message envelope) are built from trusted tick
+# dicts, so they are constructed without validation (bound once here to skip the
+# attribute lookup in the loops)
+_mk_vehicle = VehicleData.model_construct
+_mk_station = ChargingStationData.model_construct
+_mk_order = OrderData.model_construct
+_mk_stats = SimulationStats.model_construct
+_mk_state = SimulationState.model_construct
+_mk_message = WebSocketMessage.model_construct
+
+# Broadcast vehicle records are sent as arrays in this field order (advertised on full frames)
+_VEHICLE_FIELDS = ('vehicle_id', 'position', 'status', 'battery_percentage', 'current_order_id', 'destination')
+_vehicle_row = itemgetter(*_VEHICLE_FIELDS)
+
+
+def _msgpack_default(obj):
+    """Pack NumPy scalars that leak into state dicts as plain Python numbers"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize {type(obj)!r}")
+
 
 class SimulationService:
     """Service layer for simulation management"""
@@ -27,28 +63,146 @@ class SimulationService:
         self.engine: Optional[SimulationEngine] = None
         self.config: Dict = SIMULATION_CONFIG.copy()
         self.is_running: bool = False
-        self.is_paused: bool = False
-        self.simulation_thread: Optional[threading.Thread] = None
+        self._paused: bool = False
+        self._resume_event: Optional[asyncio.Event] = None  # Set while not paused (created by the loop)
+        self._resume_loop: Optional[asyncio.AbstractEventLoop] = None  # Loop that owns _resume_event
+        self.simulation_task: Optional[asyncio.Task] = None
         self.current_state: Optional[SimulationState] = None
-        self.subscribers: List[Callable] = []  # WebSocket subscribers
+        # WebSocket subscribers: an immutable snapshot replaced under the lock, so
+        # readers (tick thread, broadcast) iterate it without locking
+        self.subscribers: Tuple[Callable, ...] = ()
+        self._subscribers_lock = threading.Lock()
+        # Per-subscriber latest-wins queue (maxsize 1) and the task that drains it
+        self._subscriber_senders: Dict[Callable, Tuple[asyncio.Queue, asyncio.Task]] = {}
+        # Held by a tick while it builds state and by stop while it clears the caches
+        self._tick_lock = threading.Lock()
         self.speed_multiplier: float = 1.0
+        self._inv_speed: float = 1.0  # 1 / speed_multiplier, kept in sync by set_speed_multiplier
+        
+        # Per-vehicle delta cache: vehicle_id -> vehicle dict. Unchanged vehicles reuse
+        # their dict (and its lat/lon conversion); changes are found by comparing the
+        # state arrays with the previous tick's copy (fleet tuple, arrays, order ids)
+        self._vehicle_data_cache: Dict[str, Dict] = {}
+        self._vehicle_arrays: Optional[tuple] = None
+        self._vehicles_version: int = 0  # Never reset, so versions stay unique per process
+        
+        # Latest tick as plain dicts: (state dict, vehicles version). The broadcast path
+        # sends it as is; get_current_state() builds the Pydantic model only on demand
+        self._state_snapshot: Optional[Tuple[Dict, int]] = None
+        self._state_source: Optional[Dict] = None  # Dict that current_state was built from
+        self._vehicle_model_cache: Dict[str, Tuple[Dict, VehicleData]] = {}
         
+        # Broadcast delta encoding: only changed vehicle fields are sent between full frames
+        self.full_state_interval: int = 50  # Ticks between full frames (resync)
+        self._last_broadcast: Optional[Dict] = None
+        self._ticks_since_full: int = 0
+        self._force_full_state: bool = True
+        self._frame_seq: int = 0  # Lets clients detect dropped frames and wait for a resync
+        
+        # Broadcast quantization: positions as integer micro-degrees relative to a
+        # per-session origin, battery as 0-255. Parameters ride along on full frames
+        self.quantize_broadcast: bool = True
+        self._encoding: Optional[Dict] = None
+        self._quantized_vehicles: Dict[str, Tuple[Dict, Dict]] = {}  # id -> (source, quantized)
+        
+    @property
+    def is_paused(self) -> bool:
+        """Whether the simulation is paused"""
+        return self._paused
+    
+    @is_paused.setter
+    def is_paused(self, paused: bool):
+        self._paused = paused
+        # Wake (or park) the simulation loop instead of letting it poll while paused.
+        # asyncio.Event is not thread-safe, and the loop may run in its own thread
+        # (start_simulation without a running loop), so update it on its own loop
+        event, loop = self._resume_event, self._resume_loop
+        if event is not None and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(event.clear if paused else event.set)
+    
     def subscribe(self, callback: Callable):
-        """Subscribe to simulation state updates"""
-        self.subscribers.append(callback)
+        """Subscribe to simulation state updates (callbacks receive the encoded frame and its message type)"""
+        with self._subscribers_lock:
+            if callback in self.subscribers:
+                return
+            self.subscribers = self.subscribers + (callback,)
+        
+        # Decouple slow subscribers from the simulation loop (needs the server loop)
+        try:
+            queue = asyncio.Queue(maxsize=1)
+            task = asyncio.get_running_loop().create_task(self._subscriber_sender(callback, queue))
+            self._subscriber_senders[callback] = (queue, task)
+        except RuntimeError:
+            pass
+        # New clients need a full frame to apply deltas to
+        self._force_full_state = True
+        
+    def request_full_state(self):
+        """Send a full frame on the next tick (a new client needs one to apply deltas to)"""
+        self._force_full_state = True
         
     def unsubscribe(self, callback: Callable):
         """Unsubscribe from simulation state updates"""
-        if callback in self.subscribers:
-            self.subscribers.remove(callback)
+        with self._subscribers_lock:
+            # Bound methods compare equal (not identical) across lookups
+            self.subscribers = tuple(cb for cb in self.subscribers if cb != callback)
+        sender = self._subscriber_senders.pop(callback, None)
+        if sender is not None:
+            sender[1].cancel()
     
-    async def notify_subscribers(self, state: SimulationState):
-        """Notify all subscribers of state update"""
-        for callback in self.subscribers:
+    async def _subscriber_sender(self, callback: Callable, queue: asyncio.Queue):
+        """Deliver queued frames to one subscriber at its own pace"""
+        while True:
+            payload, message_type = await queue.get()
             try:
-                await callback(state)
+                await callback(payload, message_type)
             except Exception as e:
-                print(f"Error notifying subscriber: {e}")
+                logger.warning("Error notifying subscriber: %s", e)
+    
+    async def notify_subscribers(self, state: Dict, message_type: str = "simulation_state"):
+        """Notify all subscribers of state update"""
+        subscribers = self.subscribers
+        if not subscribers:
+            return
+        
+        # Serialize the frame once and hand the same payload to every subscriber.
+        # The envelope reuses the tick's timestamp, so every frame of a tick agrees
+        timestamp = state['timestamp']
+        if msgpack is not None:
+            # Binary frame: smaller than JSON and faster to encode/decode
+            payload = msgpack.packb({
+                "type": message_type,
+                "data": state,
+                "timestamp": timestamp
+            }, default=_msgpack_default)
+        elif orjson is None:
+            payload = _mk_message(
+                type=message_type,
+                data=state,
+                timestamp=timestamp
+            ).model_dump_json()
+        else:
+            payload = orjson.dumps({
+                "type": message_type,
+                "data": state,
+                "timestamp": timestamp
+            }, option=orjson.OPT_SERIALIZE_NUMPY)  # UTF-8 bytes, sent as a binary frame as is
+        for callback in subscribers:
+            sender = self._subscriber_senders.get(callback)
+            if sender is None:
+                try:
+                    await callback(payload, message_type)
+                except Exception as e:
+                    logger.warning("Error notifying subscriber: %s", e)
+                continue
+            
+            # Latest wins: a subscriber still sending keeps only the newest frame
+            queue = sender[0]
+            if queue.full():
+                queue.get_nowait()
+                # The dropped frame may have been a delta; resync everyone next tick
+                self._force_full_state = True
+            queue.put_nowait((payload, message_type))
     
     def create_simulation(self, config: SimulationConfig) -> bool:
         """Create new simulation with given config
@@ -140,7 +294,7 @@ class SimulationService:
         if hasattr(self, 'yaml_config') and self.yaml_config:
             return {
                 "type": "yaml", 
-                "config": self.yaml_config.dict(),
+                "config": self.yaml_config.dict_cached,
                 "legacy_config": self.config
             }
         else:
@@ -172,7 +326,7 @@ class SimulationService:
             return False
     
     def start_simulation(self) -> bool:
-        """Start simulation in background thread"""
+        """Start simulation as a task on the server event loop"""
         if self.is_running:
             return False
             
@@ -182,12 +336,12 @@ class SimulationService:
         self.is_running = True
         self.is_paused = False
         
-        # Start simulation in background thread
-        self.simulation_thread = threading.Thread(
-            target=self._simulation_loop, 
-            daemon=True
-        )
-        self.simulation_thread.start()
+        try:
+            # Called from async endpoints: run on the server loop
+            self.simulation_task = asyncio.get_running_loop().create_task(self._simulation_loop())
+        except RuntimeError:
+            # No running loop (e.g. called from a script): give the loop its own thread
+            threading.Thread(target=asyncio.run, args=(self._simulation_loop(),), daemon=True).start()
         return True
     
     def pause_simulation(self) -> bool:
@@ -208,12 +362,24 @@ class SimulationService:
         """Stop simulation"""
         self.is_running = False
         self.is_paused = False
-        if self.simulation_thread and self.simulation_thread.is_alive():
-            self.simulation_thread.join(timeout=2.0)
+        if self.simulation_task and not self.simulation_task.done():
+            self.simulation_task.cancel()
+        self.simulation_task = None
         
-        # Clear the engine instance to allow recreation
-        self.engine = None
-        self.current_state = None
+        # Clear the engine instance to allow recreation. A tick still running in its
+        # worker thread holds the lock while it touches the caches, and sees the
+        # engine change afterwards
+        with self._tick_lock:
+            self.engine = None
+            self.current_state = None
+            self._state_snapshot = None
+            self._state_source = None
+            self._vehicle_data_cache = {}
+            self._vehicle_arrays = None
+            self._vehicle_model_cache = {}
+            self._last_broadcast = None
+            self._encoding = None
+            self._quantized_vehicles = {}
         print("Simulation stopped and engine cleared")
         return True
     
@@ -238,132 +404,357 @@ class SimulationService:
         """Set simulation speed multiplier"""
         if 0.1 <= multiplier <= 10.0:
             self.speed_multiplier = multiplier
+            self._inv_speed = 1.0 / multiplier
             return True
         return False
     
     def get_current_state(self) -> Optional[SimulationState]:
-        """Get current simulation state"""
+        """Get current simulation state (model built at most once per tick)"""
+        snapshot = self._state_snapshot
+        if snapshot is None:
+            return None
+        state_dict, vehicles_version = snapshot
+        if self._state_source is not state_dict:
+            self.current_state = self._build_current_state(state_dict, vehicles_version)
+            self._state_source = state_dict
         return self.current_state
     
-    def _simulation_loop(self):
-        """Main simulation loop running in background thread"""
-        if not self.engine:
+    async def _simulation_loop(self):
+        """Main simulation loop, an asyncio task; tick work runs in a worker thread"""
+        engine = self.engine
+        if not engine:
             return
             
         try:
+            # Loop constants, read once
             duration = self.config['simulation_duration']
             base_time_step = self.config.get('time_step', 0.1)
             
-            while self.engine.current_time < duration and self.is_running:
-                if not self.is_paused:
-                    # Run simulation step
-                    self.engine.run_step()
-                    
-                    # Update current state
-                    self.current_state = self._build_current_state()
-                    
-                    # Notify subscribers asynchronously
-                    if self.subscribers:
-                        asyncio.run(self.notify_subscribers(self.current_state))
+            # Created here so it belongs to the loop that waits on it
+            resume_event = self._resume_event = asyncio.Event()
+            self._resume_loop = asyncio.get_running_loop()
+            if not self._paused:
+                resume_event.set()
+            
+            next_deadline = time.monotonic()
+            
+            while engine.current_time < duration and self.is_running:
+                if not resume_event.is_set():
+                    # Block until resumed (stop cancels the task) instead of sleeping in steps
+                    await resume_event.wait()
+                    next_deadline = time.monotonic()
+                    continue
                 
-                # Control simulation speed
-                sleep_time = base_time_step / self.speed_multiplier
-                time.sleep(sleep_time)
+                # Step and state building are CPU-bound; keep them off the event loop
+                broadcast = await asyncio.to_thread(self._run_tick, engine)
+                
+                # Notify subscribers directly on this loop, in tick order
+                if broadcast is not None:
+                    message_type, frame = broadcast
+                    await self.notify_subscribers(frame, message_type)
+                
+                # Control simulation speed against absolute deadlines, so tick work
+                # does not add to the interval; catch up instead of oversleeping
+                next_deadline += base_time_step * self._inv_speed
+                sleep_time = next_deadline - time.monotonic()
+                if sleep_time > 0:
+                    await asyncio.sleep(sleep_time)
+                else:
+                    next_deadline = time.monotonic()
             
             # Simulation completed
             self.is_running = False
             print("Simulation completed")
             
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             print(f"Error in simulation loop: {e}")
             self.is_running = False
     
-    def _build_current_state(self) -> SimulationState:
-        """Build current simulation state from engine data"""
-        if not self.engine:
-            return None
+    def _run_tick(self, engine: SimulationEngine) -> Optional[Tuple[str, Dict]]:
+        """Advance one step and publish the new state; returns the broadcast frame if anyone listens"""
+        engine.run_step()
+        
+        # The tick caches are shared with stop/restart: a tick whose engine was
+        # stopped or replaced while it ran is dropped instead of publishing
+        with self._tick_lock:
+            if engine is not self.engine:
+                return None
             
-        # Get vehicles data
-        vehicles = []
-        for vehicle in self.engine.get_vehicles():
-            # 将投影坐标转换为经纬度坐标 (Leaflet需要)
-            lon, lat = self.engine.map_manager.projected_to_latlon(vehicle.position)
+            # Update current state (plain dicts; no models on the tick path)
+            state_dict = self._build_current_state_dict(engine)
+            self._state_snapshot = (state_dict, self._vehicles_version)
             
-            # Extract current order ID from vehicle task
-            current_order_id = None
-            if vehicle.current_task and vehicle.current_task.get('type') == 'order':
-                current_order_id = vehicle.current_task.get('order_id')
+            if not self.subscribers:
+                return None
+            broadcast_state = self._quantize_state(state_dict) if self.quantize_broadcast else state_dict
+            return self._broadcast_frame(broadcast_state)
+    
+    def _broadcast_frame(self, state: Dict) -> Tuple[str, Dict]:
+        """
+        Encode a tick for broadcast: a full state on resync, otherwise a vehicle delta
+        
+        Returns:
+            (message type, data) where a "simulation_state_delta" carries
+            {"vehicles": {id: changed fields}, "added": [...], "removed": [ids]}
+            plus the (small) station/order/stats sections in full. Full-frame and
+            added vehicles are arrays in _VEHICLE_FIELDS order, without field names.
+            Every frame has a "seq" number; a delta only applies on top of seq - 1
+        """
+        previous = self._last_broadcast
+        self._last_broadcast = state
+        self._ticks_since_full += 1
+        self._frame_seq += 1
+        if previous is None or self._force_full_state or self._ticks_since_full >= self.full_state_interval:
+            self._force_full_state = False
+            self._ticks_since_full = 0
+            encoding = {'vehicle_fields': _VEHICLE_FIELDS}
+            if self.quantize_broadcast:
+                encoding.update(self._encoding)
+            return "simulation_state", dict(
+                state, vehicles=list(map(_vehicle_row, state['vehicles'])), encoding=encoding,
+                seq=self._frame_seq
+            )
+        
+        # Unchanged vehicles keep the same dict object across ticks
+        previous_vehicles = {v['vehicle_id']: v for v in previous['vehicles']}
+        changed = {}
+        added = []
+        for vehicle in state['vehicles']:
+            old = previous_vehicles.pop(vehicle['vehicle_id'], None)
+            if old is None:
+                added.append(vehicle)
+            elif old is not vehicle:
+                changed[vehicle['vehicle_id']] = {k: v for k, v in vehicle.items() if old.get(k) != v}
+        
+        return "simulation_state_delta", {
+            'vehicles': changed,
+            'added': list(map(_vehicle_row, added)),
+            'removed': list(previous_vehicles),
+            'charging_stations': state['charging_stations'],
+            'orders': state['orders'],
+            'stats': state['stats'],
+            'timestamp': state['timestamp'],
+            'seq': self._frame_seq
+        }
+    
+    def _quantize_state(self, state: Dict) -> Dict:
+        """Quantize positions and battery levels of a tick's state dict for broadcast"""
+        if self._encoding is None:
+            # Session origin near the fleet, so offsets stay small integers
+            first = state['vehicles'][0]['position'] if state['vehicles'] else [0.0, 0.0]
+            self._encoding = {
+                'origin': [round(first[0], 2), round(first[1], 2)],
+                'position_scale': 1e6,  # 6 decimals, ~11 cm
+                'battery_scale': 2.55   # percent -> 0-255
+            }
+        lon0, lat0 = self._encoding['origin']
+        
+        def q(position):
+            return [int(round((position[0] - lon0) * 1e6)), int(round((position[1] - lat0) * 1e6))]
+        
+        # Unchanged vehicles keep their quantized dict, so delta detection by identity still works
+        previous = self._quantized_vehicles
+        quantized_cache = {}
+        vehicles = []
+        for vehicle in state['vehicles']:
+            cached = previous.get(vehicle['vehicle_id'])
+            if cached is not None and cached[0] is vehicle:
+                quantized = cached[1]
+            else:
+                quantized = dict(
+                    vehicle,
+                    position=q(vehicle['position']),
+                    battery_percentage=int(round(vehicle['battery_percentage'] * 2.55))
+                )
+            quantized_cache[vehicle['vehicle_id']] = (vehicle, quantized)
+            vehicles.append(quantized)
+        self._quantized_vehicles = quantized_cache
+        
+        return {
+            'vehicles': vehicles,
+            'charging_stations': [dict(s, position=q(s['position'])) for s in state['charging_stations']],
+            'orders': [
+                dict(o, pickup_position=q(o['pickup_position']), dropoff_position=q(o['dropoff_position']))
+                for o in state['orders']
+            ],
+            'stats': state['stats'],
+            'timestamp': state['timestamp']
+        }
+    
+    def _build_current_state_dict(self, engine: SimulationEngine) -> Dict:
+        """Build current simulation state from engine data as plain dicts"""
+        # Get vehicles data (only vehicles that changed since the last tick are rebuilt)
+        vehicles_list = engine.get_vehicles()
+        positions, status_codes, batteries = engine.vehicle_state_arrays()
+        # Extract current order ID from vehicle task
+        order_ids = [
+            vehicle.current_task.get('order_id')
+            if vehicle.current_task and vehicle.current_task.get('type') == 'order' else None
+            for vehicle in vehicles_list
+        ]
+        
+        # Change mask over the structure-of-arrays state; rows line up with the previous
+        # tick only while the fleet tuple is the same object
+        previous_arrays = self._vehicle_arrays
+        if previous_arrays is not None and previous_arrays[0] is vehicles_list:
+            changed_mask = ((positions != previous_arrays[1]).any(axis=1)
+                            | (status_codes != previous_arrays[2])
+                            | (batteries != previous_arrays[3]))
+            changed_mask |= np.fromiter(
+                (a != b for a, b in zip(order_ids, previous_arrays[4])), dtype=bool, count=len(order_ids)
+            )
+        else:
+            changed_mask = np.ones(len(vehicles_list), dtype=bool)
+        self._vehicle_arrays = (vehicles_list, positions.copy(), status_codes.copy(), batteries.copy(), order_ids)
+        
+        previous_cache = self._vehicle_data_cache
+        changed_indices = np.flatnonzero(changed_mask).tolist()
+        changed_vehicles = [vehicles_list[i] for i in changed_indices]
+        
+        stations_list = engine.get_charging_stations()
+        orders_info = engine.get_orders()
+        # get_orders() returns fresh lists, so extend pending in place instead of concatenating
+        all_orders = orders_info.get('pending', [])
+        all_orders.extend(orders_info.get('active', ()))
+        
+        # 将所有需要的投影坐标一次性转换为经纬度坐标 (Leaflet需要)
+        # Layout: changed vehicles | stations | order pickups | order dropoffs
+        n_changed, n_stations, n_orders = len(changed_vehicles), len(stations_list), len(all_orders)
+        projected = np.empty((n_changed + n_stations + 2 * n_orders, 2), dtype=np.float64)
+        offset = 0
+        for entities, attr in ((changed_vehicles, 'position'), (stations_list, 'position'),
+                               (all_orders, 'pickup_position'), (all_orders, 'dropoff_position')):
+            if entities:
+                get_position = attrgetter(attr)
+                projected[offset:offset + len(entities)] = [get_position(entity) for entity in entities]
+                offset += len(entities)
+        latlon = engine.map_manager.projected_to_latlon_batch(projected).tolist()
+        vehicle_latlon = latlon[:n_changed]
+        station_latlon = latlon[n_changed:n_changed + n_stations]
+        pickup_latlon = latlon[n_changed + n_stations:n_changed + n_stations + n_orders]
+        dropoff_latlon = latlon[n_changed + n_stations + n_orders:]
+        
+        # Inner loops below use local aliases only (no repeated attribute lookups)
+        vehicles = []
+        vehicle_cache = {}
+        append_vehicle = vehicles.append
+        changed_latlon_get = dict(zip(changed_indices, vehicle_latlon)).get
+        for i, vehicle in enumerate(vehicles_list):
+            vehicle_id = vehicle.vehicle_id
+            latlon_position = changed_latlon_get(i)
+            if latlon_position is None:
+                vehicle_data = previous_cache[vehicle_id]
+            else:
+                vehicle_data = {
+                    'vehicle_id': vehicle_id,
+                    'position': latlon_position,  # [longitude, latitude] for Leaflet
+                    'status': vehicle.status,
+                    'battery_percentage': vehicle.battery_percentage,
+                    'current_order_id': order_ids[i],
+                    'destination': None  # TODO: add destination if available
+                }
             
-            vehicles.append(VehicleData(
-                vehicle_id=vehicle.vehicle_id,
-                position=[lon, lat],  # [longitude, latitude] for Leaflet
-                status=vehicle.status,
-                battery_percentage=vehicle.battery_percentage,
-                current_order_id=current_order_id,
-                destination=None  # TODO: add destination if available
-            ))
+            vehicle_cache[vehicle_id] = vehicle_data
+            append_vehicle(vehicle_data)
+        
+        if changed_vehicles or len(vehicle_cache) != len(previous_cache):
+            self._vehicles_version += 1
+        self._vehicle_data_cache = vehicle_cache
         
         # Get charging stations data
         charging_stations = []
-        for station in self.engine.get_charging_stations():
-            # 将投影坐标转换为经纬度坐标 (Leaflet需要)
-            lon, lat = self.engine.map_manager.projected_to_latlon(station.position)
-            
-            charging_stations.append(ChargingStationData(
-                station_id=station.station_id,
-                position=[lon, lat],  # [longitude, latitude] for Leaflet
-                total_slots=station.total_slots,
-                available_slots=station.available_slots,
-                utilization_rate=(station.total_slots - station.available_slots) / station.total_slots
-            ))
+        append_station = charging_stations.append
+        for station, position in zip(stations_list, station_latlon):
+            total_slots = station.total_slots
+            available_slots = station.available_slots
+            append_station({
+                'station_id': station.station_id,
+                'position': position,  # [longitude, latitude] for Leaflet
+                'total_slots': total_slots,
+                'available_slots': available_slots,
+                'utilization_rate': (total_slots - available_slots) / total_slots
+            })
         
         # Get orders data
         orders = []
-        orders_info = self.engine.get_orders()
-        all_orders = orders_info.get('pending', []) + orders_info.get('active', [])
-        
-        for order in all_orders:
-            # 将订单的上下车点坐标转换为经纬度坐标
-            pickup_lon, pickup_lat = self.engine.map_manager.projected_to_latlon(order.pickup_position)
-            dropoff_lon, dropoff_lat = self.engine.map_manager.projected_to_latlon(order.dropoff_position)
-            
-            orders.append(OrderData(
-                order_id=order.order_id,
-                pickup_position=[pickup_lon, pickup_lat],  # [longitude, latitude]
-                dropoff_position=[dropoff_lon, dropoff_lat],  # [longitude, latitude]
-                status=order.status,
-                assigned_vehicle_id=order.assigned_vehicle_id,
-                creation_time=order.creation_time,
-                assignment_time=order.assignment_time,
-                pickup_time=order.pickup_time,
-                completion_time=order.completion_time,
-                estimated_distance=order.estimated_distance,
-                final_price=order.final_price,
-                pickup_completed=(order.pickup_time is not None)
-            ))
+        append_order = orders.append
+        for order, pickup_position, dropoff_position in zip(all_orders, pickup_latlon, dropoff_latlon):
+            pickup_time = order.pickup_time
+            append_order({
+                'order_id': order.order_id,
+                'pickup_position': pickup_position,  # [longitude, latitude]
+                'dropoff_position': dropoff_position,  # [longitude, latitude]
+                'status': order.status,
+                'assigned_vehicle_id': order.assigned_vehicle_id,
+                'creation_time': order.creation_time,
+                'assignment_time': order.assignment_time,
+                'pickup_time': pickup_time,
+                'completion_time': order.completion_time,
+                'estimated_distance': order.estimated_distance,
+                'final_price': order.final_price,
+                'pickup_completed': pickup_time is not None
+            })
         
         # Get statistics
-        current_stats = self.engine.get_current_statistics()
-        stats = SimulationStats(
-            current_time=self.engine.current_time,
-            total_revenue=current_stats.get('orders', {}).get('total_revenue', 0),
-            total_cost=current_stats.get('vehicles', {}).get('total_cost', 0),
-            total_profit=current_stats.get('orders', {}).get('total_revenue', 0) - 
-                        current_stats.get('vehicles', {}).get('total_cost', 0),
-            order_completion_rate=current_stats.get('orders', {}).get('completion_rate', 0),
-            vehicle_utilization_rate=current_stats.get('vehicles', {}).get('utilization_rate', 0),
-            charging_utilization_rate=current_stats.get('charging', {}).get('utilization_rate', 0),
-            total_orders_completed=current_stats.get('orders', {}).get('total_orders_completed', 0),
-            total_orders_pending=current_stats.get('orders', {}).get('pending_orders', 0)
-        )
+        current_stats = engine.get_current_statistics()
+        order_stats = current_stats.get('orders') or {}
+        vehicle_stats = current_stats.get('vehicles') or {}
+        charging_stats = current_stats.get('charging') or {}
+        total_revenue = order_stats.get('total_revenue', 0)
+        total_cost = vehicle_stats.get('total_cost', 0)
+        stats = {
+            'current_time': engine.current_time,
+            'total_revenue': total_revenue,
+            'total_cost': total_cost,
+            'total_profit': total_revenue - total_cost,
+            'order_completion_rate': order_stats.get('completion_rate', 0),
+            'vehicle_utilization_rate': vehicle_stats.get('utilization_rate', 0),
+            'charging_utilization_rate': charging_stats.get('utilization_rate', 0),
+            'total_orders_completed': order_stats.get('total_orders_completed', 0),
+            'total_orders_pending': order_stats.get('pending_orders', 0)
+        }
+        
+        return {
+            'vehicles': vehicles,
+            'charging_stations': charging_stations,
+            'orders': orders,
+            'stats': stats,
+            'timestamp': time.time()
+        }
+    
+    def _build_current_state(self, state_dict: Dict, vehicles_version: int) -> SimulationState:
+        """Build the Pydantic simulation state (REST endpoints) from a tick's state dict"""
+        # Unchanged vehicles keep the same dict across ticks, so their model is reused too
+        previous_models = self._vehicle_model_cache
+        vehicle_models = {}
+        vehicles = []
+        for vehicle_dict in state_dict['vehicles']:
+            cached = previous_models.get(vehicle_dict['vehicle_id'])
+            if cached is not None and cached[0] is vehicle_dict:
+                vehicle_data = cached[1]
+            else:
+                vehicle_data = _mk_vehicle(**vehicle_dict)
+                vehicle_data.__dict__['as_dict'] = vehicle_dict  # Prime cached_property
+            vehicle_models[vehicle_dict['vehicle_id']] = (vehicle_dict, vehicle_data)
+            vehicles.append(vehicle_data)
+        self._vehicle_model_cache = vehicle_models
         
-        return SimulationState(
+        state = _mk_state(
             vehicles=vehicles,
-            charging_stations=charging_stations,
-            orders=orders,
-            stats=stats,
-            timestamp=time.time()
+            charging_stations=[_mk_station(**d) for d in state_dict['charging_stations']],
+            orders=[_mk_order(**d) for d in state_dict['orders']],
+            stats=_mk_stats(**state_dict['stats']),
+            timestamp=state_dict['timestamp']
         )
+        state._vehicles_version = vehicles_version
+        # The serialized lists already exist; prime the cached properties with them
+        state.__dict__['vehicle_dicts'] = state_dict['vehicles']
+        state.__dict__['charging_station_dicts'] = state_dict['charging_stations']
+        state.__dict__['order_dicts'] = state_dict['orders']
+        state.__dict__['as_dict'] = state_dict
+        return state
 
 
 # Global simulation service instance
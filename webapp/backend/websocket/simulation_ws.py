@@ -2,108 +2,239 @@
 WebSocket Real-time Communication for Simulation
 """
 
+import os
 import json
 import time
 import asyncio
-from typing import List
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from webapp.backend.models.response import WebSocketMessage, SimulationState
+from fastapi.responses import JSONResponse, ORJSONResponse
 from webapp.backend.services.simulation_service import simulation_service
 
-router = APIRouter()
+try:
+    import orjson
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    orjson = None
+    DefaultResponse = JSONResponse
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+router = APIRouter(default_response_class=DefaultResponse)
+logger = logging.getLogger(__name__)
+
+
+# Inbound client frames are text; orjson parses str directly
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps(message: Dict[str, Any]) -> Union[str, bytes]:
+    """Serialize an outbound message dict to JSON (orjson UTF-8 bytes when available)"""
+    if orjson is None:
+        return json.dumps(message)
+    return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+async def _send(websocket: WebSocket, message: Union[str, bytes]):
+    """Send bytes as a binary frame (no UTF-8 encode pass) and str as a text frame"""
+    if isinstance(message, bytes):
+        await websocket.send_bytes(message)
+    else:
+        await websocket.send_text(message)
+
+
+def _envelope(message_type: str, data: Any) -> Union[str, bytes]:
+    """Outbound message in the WebSocketMessage shape, without building the model"""
+    return _dumps({"type": message_type, "data": data, "timestamp": time.time()})
+
+
+# Fixed error replies are encoded once; a client flooding bad frames costs no
+# allocation per reply (no timestamp, which clients ignore on errors)
+_INVALID_JSON_ERROR = _dumps({"type": "error", "data": {"error": "Invalid JSON format"}})
 
 
 class ConnectionManager:
     """Manages WebSocket connections"""
     
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, queue_size: int = 64, flush_interval: float = 0.016, max_connections: int = 1024):
+        self.active_connections: Set[WebSocket] = set()
+        self.max_connections = max_connections  # With queue_size, bounds broadcast memory
+        self.broadcast_batch_size = 50  # Connections per fan-out chunk
+        
+        # Each connection drains its own bounded outbox of (message type, message) in a
+        # writer task, so a slow client only falls behind itself; broadcasting never
+        # waits on a socket
+        self.queue_size = queue_size
+        self._outboxes: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+        # Connections with no full frame to apply deltas to (new, or dropped a frame):
+        # their writers skip deltas until the next full frame
+        self._needs_full: Set[WebSocket] = set()
+        
+        # State frames arriving within one flush window are sent as a single batch frame
+        self.flush_interval = flush_interval  # seconds
+        self._pending: List[Tuple[str, Union[str, bytes]]] = []  # (message type, payload)
+        self._flush_task: Optional[asyncio.Task] = None
     
-    async def connect(self, websocket: WebSocket):
-        """Accept new WebSocket connection"""
+    async def connect(self, websocket: WebSocket, initial_messages: Sequence[Union[str, bytes]] = ()) -> bool:
+        """
+        Accept new WebSocket connection, or close it with 1013 (try again later) when full
+        
+        Args:
+            websocket: The connection
+            initial_messages: Sent first, ahead of any broadcast frame
+        """
         await websocket.accept()
-        self.active_connections.append(websocket)
-        print(f"New WebSocket connection. Total: {len(self.active_connections)}")
+        if len(self.active_connections) >= self.max_connections:
+            await websocket.close(code=1013)
+            logger.warning("WebSocket rejected, connection limit (%d) reached", self.max_connections)
+            return False
+        
+        # The writer task is the only sender on the socket; queueing the greeting
+        # before the outbox joins the broadcast keeps it ahead of every state frame
+        outbox = asyncio.Queue(maxsize=self.queue_size)
+        for message in initial_messages:
+            outbox.put_nowait((None, message))
+        self.active_connections.add(websocket)
+        self._needs_full.add(websocket)
+        self._outboxes[websocket] = outbox
+        self._writers[websocket] = asyncio.get_running_loop().create_task(self._writer_loop(websocket, outbox))
+        # Deltas only apply on top of a full frame
+        simulation_service.request_full_state()
+        logger.info("New WebSocket connection. Total: %d", len(self.active_connections))
+        return True
     
     def disconnect(self, websocket: WebSocket):
         """Remove WebSocket connection"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        print(f"WebSocket disconnected. Total: {len(self.active_connections)}")
+        if websocket not in self.active_connections:
+            return
+        self.active_connections.discard(websocket)
+        self._needs_full.discard(websocket)
+        self._outboxes.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+        logger.info("WebSocket disconnected. Total: %d", len(self.active_connections))
     
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        """Send message to specific WebSocket connection"""
-        try:
-            await websocket.send_text(message)
-        except Exception as e:
-            print(f"Error sending personal message: {e}")
-            self.disconnect(websocket)
-    
-    async def broadcast(self, message: str):
-        """Broadcast message to all connected clients"""
-        disconnected = []
-        
-        for connection in self.active_connections:
+    async def _writer_loop(self, websocket: WebSocket, outbox: asyncio.Queue):
+        """Send queued messages to one connection, in order"""
+        needs_full = self._needs_full
+        while True:
+            message_type, message = await outbox.get()
+            if websocket in needs_full:
+                if message_type == "simulation_state_delta":
+                    continue  # The client could not apply it
+                if message_type == "simulation_state":
+                    needs_full.discard(websocket)
             try:
-                await connection.send_text(message)
+                await _send(websocket, message)
             except Exception as e:
-                print(f"Error broadcasting to connection: {e}")
-                disconnected.append(connection)
-        
-        # Remove disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
+                # Expected when a client goes away; can fire for many clients at once
+                logger.debug("Error broadcasting to connection: %s", e)
+                self.disconnect(websocket)
+                return
     
-    async def send_simulation_state(self, state: SimulationState):
-        """Send simulation state to all connected clients"""
-        message = WebSocketMessage(
-            type="simulation_state",
-            data=state.dict(),
-            timestamp=time.time()
-        )
-        
-        await self.broadcast(message.json())
+    def _enqueue(self, websocket: WebSocket, outbox: asyncio.Queue, item: Tuple[Optional[str], Union[str, bytes]]):
+        """Non-blocking put; a full outbox drops its oldest message"""
+        try:
+            outbox.put_nowait(item)
+        except asyncio.QueueFull:
+            outbox.get_nowait()
+            outbox.put_nowait(item)
+            # The dropped message may have been a delta: only this connection
+            # waits for the next (periodic) full frame, the others keep their deltas
+            self._needs_full.add(websocket)
+    
+    async def send_personal_message(self, message: Union[str, bytes], websocket: WebSocket):
+        """Queue a message for one WebSocket connection, in order with its broadcast frames"""
+        outbox = self._outboxes.get(websocket)
+        if outbox is not None:
+            self._enqueue(websocket, outbox, (None, message))
+    
+    async def broadcast(self, message: Union[str, bytes], message_type: Optional[str] = None):
+        """Queue a message for every connected client (bytes go out as binary frames)"""
+        targets = list(self._outboxes.items())
+        item = (message_type, message)
+        enqueue = self._enqueue
+        batch_size = self.broadcast_batch_size
+        for start in range(0, len(targets), batch_size):
+            for websocket, outbox in targets[start:start + batch_size]:
+                enqueue(websocket, outbox, item)
+            
+            # Yield between chunks so a very large pool doesn't starve other work
+            if start + batch_size < len(targets):
+                await asyncio.sleep(0)
+    
+    async def send_simulation_state(self, payload: Union[str, bytes], message_type: str = "simulation_state"):
+        """Queue a serialized simulation state frame for the next batched broadcast"""
+        self._pending.append((message_type, payload))
+        if len(self._pending) == 1:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_after_window())
+    
+    async def _flush_after_window(self):
+        """Broadcast the frames collected during one flush window, in order"""
+        await asyncio.sleep(self.flush_interval)
+        pending, self._pending = self._pending, []
+        message_types, frames = zip(*pending)
+        # A batch holding a full frame resyncs a client (it skips the deltas before it)
+        batch_type = "simulation_state" if "simulation_state" in message_types else "simulation_state_delta"
+        timestamp = time.time()  # One clock read per flushed batch
+        if len(frames) == 1:
+            await self.broadcast(frames[0], batch_type)
+        elif isinstance(frames[0], bytes) and frames[0][:1] != b"{":
+            # MessagePack frames are nested as binary items; the client decodes each one
+            await self.broadcast(msgpack.packb({
+                "type": "simulation_state_batch",
+                "data": frames,
+                "timestamp": timestamp
+            }), batch_type)
+        elif isinstance(frames[0], bytes):
+            # JSON frames are already encoded; splice them into the batch array as is
+            await self.broadcast(
+                b'{"type":"simulation_state_batch","data":[' + b",".join(frames)
+                + b'],"timestamp":' + repr(timestamp).encode() + b'}',
+                batch_type
+            )
+        else:
+            await self.broadcast(
+                '{"type":"simulation_state_batch","data":[' + ",".join(frames)
+                + '],"timestamp":' + repr(timestamp) + '}',
+                batch_type
+            )
 
 
-# Global connection manager
-manager = ConnectionManager()
+# Global connection manager (EV_MAX_WS caps concurrent connections)
+manager = ConnectionManager(max_connections=int(os.environ.get("EV_MAX_WS", "1024")))
 
 
 @router.websocket("/simulation")
 async def simulation_websocket(websocket: WebSocket):
     """WebSocket endpoint for real-time simulation updates"""
-    await manager.connect(websocket)
+    # Initial status, then the current state if available
+    initial_messages = [
+        _envelope("connection", {"status": "connected", "message": "WebSocket connection established"})
+    ]
+    current_state = simulation_service.get_current_state()
+    if current_state:
+        initial_messages.append(_envelope("simulation_state", current_state.as_dict))
+    
+    if not await manager.connect(websocket, initial_messages):
+        return
     
-    # Subscribe to simulation updates
+    # Subscribe to simulation updates (one subscription broadcasts to every connection)
     simulation_service.subscribe(manager.send_simulation_state)
     
     try:
-        # Send initial status
-        initial_message = WebSocketMessage(
-            type="connection",
-            data={"status": "connected", "message": "WebSocket connection established"},
-            timestamp=time.time()
-        )
-        await manager.send_personal_message(initial_message.json(), websocket)
-        
-        # Send current state if available
-        current_state = simulation_service.get_current_state()
-        if current_state:
-            await manager.send_personal_message(
-                WebSocketMessage(
-                    type="simulation_state",
-                    data=current_state.dict(),
-                    timestamp=time.time()
-                ).json(),
-                websocket
-            )
-        
         # Keep connection alive and handle incoming messages
         while True:
             try:
                 # Wait for client messages (commands, etc.)
                 data = await websocket.receive_text()
-                message = json.loads(data)
+                message = _loads(data)
                 
                 # Handle client commands
                 await handle_client_message(message, websocket)
@@ -111,28 +242,19 @@ async def simulation_websocket(websocket: WebSocket):
             except WebSocketDisconnect:
                 break
             except json.JSONDecodeError:
-                # Send error message for invalid JSON
-                error_message = WebSocketMessage(
-                    type="error",
-                    data={"error": "Invalid JSON format"},
-                    timestamp=time.time()
-                )
-                await manager.send_personal_message(error_message.json(), websocket)
+                # Send error message for invalid JSON (orjson.JSONDecodeError subclasses it)
+                await manager.send_personal_message(_INVALID_JSON_ERROR, websocket)
             except Exception as e:
                 # Send error message for other exceptions
-                error_message = WebSocketMessage(
-                    type="error",
-                    data={"error": str(e)},
-                    timestamp=time.time()
-                )
-                await manager.send_personal_message(error_message.json(), websocket)
+                await manager.send_personal_message(_envelope("error", {"error": str(e)}), websocket)
                 
     except WebSocketDisconnect:
         pass
     finally:
         # Cleanup
         manager.disconnect(websocket)
-        simulation_service.unsubscribe(manager.send_simulation_state)
+        if not manager.active_connections:
+            simulation_service.unsubscribe(manager.send_simulation_state)
 
 
 async def handle_client_message(message: dict, websocket: WebSocket):
@@ -162,48 +284,36 @@ async def handle_client_message(message: dict, websocket: WebSocket):
                 success = False
             
             # Send response
-            response = WebSocketMessage(
-                type="control_response",
-                data={
-                    "command": command,
-                    "success": success,
-                    "message": f"Command '{command}' {'executed' if success else 'failed'}"
-                },
-                timestamp=time.time()
-            )
-            await manager.send_personal_message(response.json(), websocket)
+            response = _envelope("control_response", {
+                "command": command,
+                "success": success,
+                "message": f"Command '{command}' {'executed' if success else 'failed'}"
+            })
+            await manager.send_personal_message(response, websocket)
             
         elif message_type == "ping":
             # Handle ping/keepalive
-            pong_message = WebSocketMessage(
-                type="pong",
-                data={"message": "pong"},
-                timestamp=time.time()
-            )
-            await manager.send_personal_message(pong_message.json(), websocket)
+            await manager.send_personal_message(_envelope("pong", {"message": "pong"}), websocket)
             
         else:
             # Unknown message type
-            error_message = WebSocketMessage(
-                type="error",
-                data={"error": f"Unknown message type: {message_type}"},
-                timestamp=time.time()
+            await manager.send_personal_message(
+                _envelope("error", {"error": f"Unknown message type: {message_type}"}),
+                websocket
             )
-            await manager.send_personal_message(error_message.json(), websocket)
             
     except Exception as e:
-        error_message = WebSocketMessage(
-            type="error",
-            data={"error": f"Error handling message: {str(e)}"},
-            timestamp=time.time()
+        await manager.send_personal_message(
+            _envelope("error", {"error": f"Error handling message: {str(e)}"}),
+            websocket
         )
-        await manager.send_personal_message(error_message.json(), websocket)
 
 
 @router.get("/connections")
 async def get_websocket_connections():
     """Get number of active WebSocket connections"""
-    return {
+    # Returned as a response directly, skipping jsonable_encoder
+    return DefaultResponse({
         "active_connections": len(manager.active_connections),
         "status": "healthy"
-    } 
\ No newline at end of file
+    }) 
\ No newline at end of file
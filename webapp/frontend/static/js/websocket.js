@@ -10,6 +10,9 @@ class SimulationWebSocket {
         this.maxReconnectAttempts = 5;
         this.reconnectInterval = 3000; // 3 seconds
         this.messageHandlers = new Map();
+        this.lastState = null; // Last full simulation state, base for delta frames
+        this.encoding = null; // Record layout / quantization parameters from the last full frame
+        this.lastSeq = null; // Sequence number of the last applied state frame
         
         // Bind methods
         this.connect = this.connect.bind(this);
@@ -26,6 +29,7 @@ class SimulationWebSocket {
             
             console.log('Connecting to WebSocket:', wsUrl);
             this.ws = new WebSocket(wsUrl);
+            this.ws.binaryType = 'arraybuffer'; // Simulation frames may be MessagePack
             
             this.ws.onopen = this.onOpen;
             this.ws.onmessage = this.onMessage;
@@ -50,13 +54,22 @@ class SimulationWebSocket {
     
     onMessage(event) {
         try {
-            const message = JSON.parse(event.data);
+            const message = typeof event.data === 'string'
+                ? JSON.parse(event.data)
+                : this.decodeBinary(new Uint8Array(event.data));
             this.handleMessage(message);
         } catch (error) {
             console.error('Error parsing WebSocket message:', error);
         }
     }
     
+    // Binary frames are MessagePack, or UTF-8 JSON ('{' is never the first byte of a MessagePack map)
+    decodeBinary(bytes) {
+        return bytes[0] === 0x7b
+            ? JSON.parse(new TextDecoder().decode(bytes))
+            : MessagePack.decode(bytes);
+    }
+    
     onClose(event) {
         console.log('WebSocket disconnected:', event.code, event.reason);
         this.isConnected = false;
@@ -110,7 +123,29 @@ class SimulationWebSocket {
                 break;
                 
             case 'simulation_state':
-                this.notifyHandlers('simulation_state', data);
+                this.encoding = data.encoding || null;
+                this.lastState = this.decodeState(data);
+                this.lastSeq = data.seq ?? null;
+                this.notifyHandlers('simulation_state', this.lastState);
+                break;
+                
+            case 'simulation_state_delta':
+                // Rebuild the full state from the last one; after a dropped frame (sequence gap)
+                // ignore deltas until the next full frame arrives
+                if (this.lastState && this.lastSeq !== null && data.seq === this.lastSeq + 1) {
+                    this.lastState = this.applyStateDelta(this.lastState, this.decodeDelta(data));
+                    this.lastSeq = data.seq;
+                    this.notifyHandlers('simulation_state', this.lastState);
+                } else {
+                    this.lastState = null;
+                }
+                break;
+                
+            case 'simulation_state_batch':
+                // Several ticks coalesced into one frame, in tick order
+                data.forEach(frame => this.handleMessage(
+                    frame instanceof Uint8Array ? MessagePack.decode(frame) : frame
+                ));
                 break;
                 
             case 'control_response':
@@ -131,6 +166,88 @@ class SimulationWebSocket {
         }
     }
     
+    // Full-frame and added vehicles arrive as arrays in encoding.vehicle_fields order.
+    // Quantized frames: positions are integer offsets from encoding.origin, battery is 0-255
+    decodePosition(position) {
+        const { origin, position_scale } = this.encoding;
+        return [origin[0] + position[0] / position_scale, origin[1] + position[1] / position_scale];
+    }
+    
+    decodeVehicleRow(row) {
+        const vehicle = {};
+        this.encoding.vehicle_fields.forEach((field, i) => { vehicle[field] = row[i]; });
+        return this.decodeVehicle(vehicle);
+    }
+    
+    decodeVehicle(vehicle) {
+        if (!this.encoding.origin) return vehicle;
+        const decoded = { ...vehicle };
+        if (vehicle.position) decoded.position = this.decodePosition(vehicle.position);
+        if (vehicle.battery_percentage !== undefined) {
+            decoded.battery_percentage = vehicle.battery_percentage / this.encoding.battery_scale;
+        }
+        return decoded;
+    }
+    
+    decodeStationsAndOrders(data) {
+        if (!this.encoding.origin) {
+            return { charging_stations: data.charging_stations, orders: data.orders };
+        }
+        return {
+            charging_stations: data.charging_stations.map(station => ({
+                ...station, position: this.decodePosition(station.position)
+            })),
+            orders: data.orders.map(order => ({
+                ...order,
+                pickup_position: this.decodePosition(order.pickup_position),
+                dropoff_position: this.decodePosition(order.dropoff_position)
+            }))
+        };
+    }
+    
+    decodeState(data) {
+        if (!this.encoding) return data;
+        return {
+            ...data,
+            ...this.decodeStationsAndOrders(data),
+            vehicles: data.vehicles.map(row => this.decodeVehicleRow(row))
+        };
+    }
+    
+    decodeDelta(delta) {
+        if (!this.encoding) return delta;
+        const vehicles = {};
+        for (const [vehicleId, changes] of Object.entries(delta.vehicles)) {
+            vehicles[vehicleId] = this.decodeVehicle(changes);
+        }
+        return {
+            ...delta,
+            ...this.decodeStationsAndOrders(delta),
+            vehicles: vehicles,
+            added: delta.added.map(row => this.decodeVehicleRow(row))
+        };
+    }
+    
+    applyStateDelta(state, delta) {
+        const removed = new Set(delta.removed);
+        const vehicles = [];
+        
+        for (const vehicle of state.vehicles) {
+            if (removed.has(vehicle.vehicle_id)) continue;
+            const changes = delta.vehicles[vehicle.vehicle_id];
+            vehicles.push(changes ? { ...vehicle, ...changes } : vehicle);
+        }
+        vehicles.push(...delta.added);
+        
+        return {
+            vehicles: vehicles,
+            charging_stations: delta.charging_stations,
+            orders: delta.orders,
+            stats: delta.stats,
+            timestamp: delta.timestamp
+        };
+    }
+    
     // Event handler registration
     on(event, handler) {
         if (!this.messageHandlers.has(event)) {